@@ -44,7 +44,6 @@ class BriefParser:
 
     def parse(self) -> ScaffoldSpec:
         content = self.path.read_text(encoding="utf-8")
-        norm_body = self._normalize_text(content)
         meta = self._parse_frontmatter(content)
         body = self._strip_frontmatter(content)
         norm = self._normalize_text(body)
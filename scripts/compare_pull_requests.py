@@ -11,24 +11,34 @@ network access.
 from __future__ import annotations
 
 import argparse
-import importlib
-import importlib.util
+import io
 import json
 import os
 import re
 import sys
+import time
 from collections import deque
 from dataclasses import asdict, dataclass, field
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 
-requests_spec = importlib.util.find_spec("requests")
-requests = importlib.import_module("requests") if requests_spec else None  # type: ignore[assignment]
+from json_io import dumps_pretty, loads
 
 
 GITHUB_API_BASE = "https://api.github.com"
-
-
-@dataclass
+RATE_LIMIT_RETRIES = 3
+LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+PRIORITY_RANK = {"Critical": 3, "High": 2, "Medium": 1, "Low": 0}
+RISK_RANK = {"Critical": 3, "High": 2, "Medium": 1, "Low": 0}
+DEPENDENCY_KEYWORDS = ("depends on", "blocked by", "requires", "/pull/")
+DEPENDENCY_PATTERNS = [
+    re.compile(r"depends on\s+#(\d+)", re.IGNORECASE),
+    re.compile(r"blocked by\s+#(\d+)", re.IGNORECASE),
+    re.compile(r"requires\s+#(\d+)", re.IGNORECASE),
+    re.compile(r"https://github\.com/[\w-]+/[\w-]+/pull/(\d+)", re.IGNORECASE),
+]
+
+
+@dataclass(slots=True)
 class PullRequestSummary:
     """Normalized data about a pull request with derived insights."""
 
@@ -62,6 +72,9 @@ class PullRequestSummary:
     files: List[str] = field(default_factory=list)
     tests_touched: bool = False
     conflicts: Dict[int, List[str]] = field(default_factory=dict)
+    _sort_key_cache: Tuple[int, int, int] = field(default=(1, 1, 0), init=False, repr=False)
+    _labels_lower: List[str] = field(default_factory=list, init=False, repr=False)
+    _label_set: FrozenSet[str] = field(default=frozenset(), init=False, repr=False)
 
     @property
     def additions_plus_deletions(self) -> int:
@@ -77,12 +90,17 @@ class PullRequestComparator:
 
     def __init__(self, repo: Optional[str] = None, token: Optional[str] = None) -> None:
         self.repo = repo
-        if requests is None and repo:
-            raise SystemExit(
-                "The 'requests' package is required for fetching GitHub data. "
-                "Install it or provide --input for offline analysis."
-            )
-        self.session = requests.Session() if requests else None
+        self.session = None
+        if repo:
+            # Imported lazily so offline --input runs never pay for requests/urllib3.
+            try:
+                import requests as _requests
+            except ImportError:
+                raise SystemExit(
+                    "The 'requests' package is required for fetching GitHub data. "
+                    "Install it or provide --input for offline analysis."
+                )
+            self.session = _requests.Session()
         if self.session:
             headers = {
                 "Accept": "application/vnd.github+json",
@@ -112,14 +130,20 @@ class PullRequestComparator:
         return summaries
 
     def render_markdown(self, summaries: Sequence[PullRequestSummary]) -> str:
-        blocks: List[str] = []
-        blocks.append(self._render_summary_table(summaries))
-        blocks.append(self._render_review_signals(summaries))
-        blocks.append(self._render_dependency_map(summaries))
-        blocks.append(self._render_recommended_order(summaries))
-        blocks.append(self._render_conflict_matrix(summaries))
-        blocks.append(self._render_detailed_notes(summaries))
-        return "\n\n".join(block for block in blocks if block)
+        buf = io.StringIO()
+        renderers = (
+            self._render_summary_table,
+            self._render_review_signals,
+            self._render_dependency_map,
+            self._render_recommended_order,
+            self._render_conflict_matrix,
+            self._render_detailed_notes,
+        )
+        for position, renderer in enumerate(renderers):
+            if position:
+                buf.write("\n\n")
+            renderer(buf, summaries)
+        return buf.getvalue()
 
     def render_text(self, summaries: Sequence[PullRequestSummary]) -> str:
         markdown = self.render_markdown(summaries)
@@ -130,7 +154,7 @@ class PullRequestComparator:
         if not self.session:
             raise RuntimeError("GitHub session unavailable; cannot fetch pull requests.")
         url = f"{GITHUB_API_BASE}/repos/{self.repo}/pulls/{number}"
-        response = self.session.get(url, timeout=30)
+        response = self._get(url)
         if response.status_code == 404:
             raise SystemExit(f"Pull request #{number} not found in {self.repo}.")
         if response.status_code == 401:
@@ -139,7 +163,47 @@ class PullRequestComparator:
             raise SystemExit(
                 f"GitHub API error ({response.status_code}): {response.text.strip()}"
             )
-        return response.json()
+        return loads(response.content)
+
+    def _get(self, url: str):
+        """GET ``url``, waiting out GitHub rate limits instead of failing the run."""
+        for _ in range(RATE_LIMIT_RETRIES + 1):
+            response = self.session.get(url, timeout=30)
+            if not self._is_rate_limited(response):
+                self._check_rate_limit(response)
+                return response
+            self._wait_for_rate_limit(response)
+        raise SystemExit(
+            f"GitHub rate limit still exceeded after {RATE_LIMIT_RETRIES} retries: {url}"
+        )
+
+    def _is_rate_limited(self, response) -> bool:
+        if response.status_code == 429:
+            return True
+        return (
+            response.status_code == 403
+            and response.headers.get("X-RateLimit-Remaining") == "0"
+        )
+
+    def _check_rate_limit(self, response) -> None:
+        """Pause before the next request once the current quota is exhausted."""
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            self._wait_for_rate_limit(response)
+
+    def _wait_for_rate_limit(self, response) -> None:
+        retry_after = response.headers.get("Retry-After")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        elif reset and reset.isdigit():
+            delay = max(0.0, int(reset) - time.time()) + 1
+        else:
+            delay = 60.0
+        print(
+            f"GitHub rate limit reached; waiting {delay:.0f}s before retrying.",
+            file=sys.stderr,
+        )
+        time.sleep(delay)
 
     def _fetch_reviews(self, number: int) -> List[dict]:
         if not self.session:
@@ -159,16 +223,17 @@ class PullRequestComparator:
         next_url: Optional[str] = url
         items: List[dict] = []
         while next_url:
-            response = self.session.get(next_url, timeout=30)
+            response = self._get(next_url)
             if response.status_code != 200:
                 raise SystemExit(
                     f"GitHub API error ({response.status_code}): {response.text.strip()}"
                 )
-            payload = response.json()
+            payload = loads(response.content)
             if isinstance(payload, list):
                 items.extend(payload)
-            next_link = response.links.get("next") if response.links else None
-            next_url = next_link.get("url") if next_link else None
+            link_header = response.headers.get("Link")
+            match = LINK_NEXT_RE.search(link_header) if link_header else None
+            next_url = match.group(1) if match else None
         return items
 
     # -------------------- Normalization --------------------
@@ -213,6 +278,8 @@ class PullRequestComparator:
             files=filenames,
             tests_touched=self._detect_tests(filenames),
         )
+        summary._labels_lower = [label.lower() for label in labels]
+        summary._label_set = frozenset(summary._labels_lower)
         summary.dependencies = self._extract_dependencies(summary.body)
         summary.risk_level, summary.risk_reasons = self._assess_risk(summary)
         summary.priority, summary.priority_reasons = self._determine_priority(summary)
@@ -242,6 +309,7 @@ class PullRequestComparator:
             }
         for summary in summaries:
             summary.recommended_action = self._recommend_action(summary, state_index)
+            summary._sort_key_cache = self._sort_key(summary)
 
     # -------------------- Analysis helpers --------------------
     def _detect_tests(self, filenames: Sequence[str]) -> bool:
@@ -258,16 +326,12 @@ class PullRequestComparator:
         return False
 
     def _extract_dependencies(self, text: str) -> List[int]:
-        patterns = [
-            r"depends on\s+#(\d+)",
-            r"blocked by\s+#(\d+)",
-            r"requires\s+#(\d+)",
-            r"https://github\.com/[\w-]+/[\w-]+/pull/(\d+)",
-        ]
-        dependencies: List[int] = []
         lower_text = text.lower()
-        for pattern in patterns:
-            for match in re.finditer(pattern, lower_text, flags=re.IGNORECASE):
+        if not any(keyword in lower_text for keyword in DEPENDENCY_KEYWORDS):
+            return []
+        dependencies: List[int] = []
+        for pattern in DEPENDENCY_PATTERNS:
+            for match in pattern.finditer(lower_text):
                 try:
                     number = int(match.group(1))
                 except ValueError:
@@ -286,12 +350,12 @@ class PullRequestComparator:
         }
         reasons: List[str] = []
         detected_label: Optional[str] = None
-        for label in summary.labels:
-            lower_label = label.lower()
-            if lower_label in label_mapping:
-                detected_label = label_mapping[lower_label]
-                reasons.append(f"Label '{label}'")
-                break
+        if not summary._label_set.isdisjoint(label_mapping):
+            for label, lower_label in zip(summary.labels, summary._labels_lower):
+                if lower_label in label_mapping:
+                    detected_label = label_mapping[lower_label]
+                    reasons.append(f"Label '{label}'")
+                    break
         if summary.change_requests:
             reasons.append(
                 f"{summary.change_requests} change request(s) pending review resolution"
@@ -330,12 +394,11 @@ class PullRequestComparator:
             "urgent": "High",
         }
         reasons: List[str] = []
-        for label in summary.labels:
-            lower_label = label.lower()
-            if lower_label in priority_mapping:
-                priority = priority_mapping[lower_label]
-                reasons.append(f"Label '{label}'")
-                return priority, reasons
+        if not summary._label_set.isdisjoint(priority_mapping):
+            for label, lower_label in zip(summary.labels, summary._labels_lower):
+                if lower_label in priority_mapping:
+                    reasons.append(f"Label '{label}'")
+                    return priority_mapping[lower_label], reasons
         if summary.change_requests:
             reasons.append("Outstanding change requests")
             return "High", reasons
@@ -388,128 +451,133 @@ class PullRequestComparator:
         return "✅ Ready for standard review"
 
     # -------------------- Rendering helpers --------------------
-    def _render_summary_table(self, summaries: Sequence[PullRequestSummary]) -> str:
-        header = "| PR | Title | State | Risk | Priority | Action |"
-        separator = "|----|-------|--------|------|----------|--------|"
-        rows = [header, separator]
+    def _render_summary_table(
+        self, out: io.StringIO, summaries: Sequence[PullRequestSummary]
+    ) -> None:
+        out.write("| PR | Title | State | Risk | Priority | Action |\n")
+        out.write("|----|-------|--------|------|----------|--------|")
         for summary in summaries:
             title = summary.title.replace("|", "\\|")
             action = summary.recommended_action.replace("|", "\\|")
-            rows.append(
-                f"| #{summary.number} | {title} | {summary.state.title()} | "
+            out.write(
+                f"\n| #{summary.number} | {title} | {summary.state.title()} | "
                 f"{summary.risk_level} | {summary.priority} | {action} |"
             )
-        return "\n".join(rows)
 
-    def _render_review_signals(self, summaries: Sequence[PullRequestSummary]) -> str:
-        header = "| PR | Approvals | Change Requests | Mergeable | Tests? |"
-        separator = "|----|-----------|-----------------|-----------|--------|"
-        rows = ["### Review Signals", "", header, separator]
+    def _render_review_signals(
+        self, out: io.StringIO, summaries: Sequence[PullRequestSummary]
+    ) -> None:
+        out.write("### Review Signals\n\n")
+        out.write("| PR | Approvals | Change Requests | Mergeable | Tests? |\n")
+        out.write("|----|-----------|-----------------|-----------|--------|")
         for summary in summaries:
             mergeable = summary.mergeable_state or "unknown"
             tests = "✅" if summary.tests_touched else "—"
-            rows.append(
-                f"| #{summary.number} | {summary.approvals} | {summary.change_requests} | "
+            out.write(
+                f"\n| #{summary.number} | {summary.approvals} | {summary.change_requests} | "
                 f"{mergeable} | {tests} |"
             )
-        return "\n".join(rows)
 
-    def _render_dependency_map(self, summaries: Sequence[PullRequestSummary]) -> str:
-        lines = ["### Dependency Map", ""]
+    def _render_dependency_map(
+        self, out: io.StringIO, summaries: Sequence[PullRequestSummary]
+    ) -> None:
+        out.write("### Dependency Map\n")
         for summary in summaries:
             if summary.dependencies:
                 deps = ", ".join(f"#{dep}" for dep in summary.dependencies)
-                lines.append(f"- PR #{summary.number} depends on {deps}")
+                out.write(f"\n- PR #{summary.number} depends on {deps}")
             else:
-                lines.append(f"- PR #{summary.number} has no listed dependencies")
-        return "\n".join(lines)
+                out.write(f"\n- PR #{summary.number} has no listed dependencies")
 
-    def _render_recommended_order(self, summaries: Sequence[PullRequestSummary]) -> str:
+    def _render_recommended_order(
+        self, out: io.StringIO, summaries: Sequence[PullRequestSummary]
+    ) -> None:
         order = self._compute_order(summaries)
-        lines = ["### Recommended Review/Merge Order", ""]
+        out.write("### Recommended Review/Merge Order\n")
         for position, summary in enumerate(order, start=1):
-            lines.append(
-                f"{position}. PR #{summary.number} – {summary.title}"
+            out.write(
+                f"\n{position}. PR #{summary.number} – {summary.title}"
                 f" (Risk: {summary.risk_level}, Priority: {summary.priority})"
             )
-        return "\n".join(lines)
 
-    def _render_conflict_matrix(self, summaries: Sequence[PullRequestSummary]) -> str:
-        lines = ["### Conflict Hotspots", ""]
+    def _render_conflict_matrix(
+        self, out: io.StringIO, summaries: Sequence[PullRequestSummary]
+    ) -> None:
+        out.write("### Conflict Hotspots\n")
         conflicts_found = False
         for summary in summaries:
             if not summary.conflicts:
                 continue
             conflicts_found = True
-            lines.append(f"- PR #{summary.number} overlaps with:")
+            out.write(f"\n- PR #{summary.number} overlaps with:")
             for other, files in sorted(summary.conflicts.items()):
                 file_list = ", ".join(files[:5])
                 if len(files) > 5:
                     file_list += ", …"
-                lines.append(f"  - PR #{other}: {file_list}")
+                out.write(f"\n  - PR #{other}: {file_list}")
         if not conflicts_found:
-            lines.append("- No overlapping files detected")
-        return "\n".join(lines)
+            out.write("\n- No overlapping files detected")
 
-    def _render_detailed_notes(self, summaries: Sequence[PullRequestSummary]) -> str:
-        lines = ["### Detailed Notes", ""]
+    def _render_detailed_notes(
+        self, out: io.StringIO, summaries: Sequence[PullRequestSummary]
+    ) -> None:
+        out.write("### Detailed Notes")
         for summary in summaries:
-            lines.append(f"#### PR #{summary.number}: {summary.title}")
-            lines.append("- **URL**: " + summary.url)
-            lines.append(
-                "- **State**: "
+            out.write(f"\n\n#### PR #{summary.number}: {summary.title}")
+            out.write("\n- **URL**: " + summary.url)
+            out.write(
+                "\n- **State**: "
                 f"{summary.state.title()} (Draft: {str(summary.draft).lower()}, Merged: {str(summary.merged).lower()})"
             )
-            lines.append(
-                "- **Branches**: "
+            out.write(
+                "\n- **Branches**: "
                 f"{summary.head_branch or 'unknown'} → {summary.base_branch or 'unknown'}"
             )
-            lines.append(
-                "- **Change Size**: "
+            out.write(
+                "\n- **Change Size**: "
                 f"{summary.additions} additions / {summary.deletions} deletions / {summary.changed_files} files"
             )
             if summary.tests_touched:
-                lines.append("- **Tests**: ✅ Tests updated")
+                out.write("\n- **Tests**: ✅ Tests updated")
             else:
-                lines.append("- **Tests**: —")
-            lines.append("- **Labels**: " + (", ".join(summary.labels) or "(none)"))
-            lines.append(
-                "- **Risk**: "
+                out.write("\n- **Tests**: —")
+            out.write("\n- **Labels**: " + (", ".join(summary.labels) or "(none)"))
+            out.write(
+                "\n- **Risk**: "
                 f"{summary.risk_level} – {', '.join(summary.risk_reasons) or 'n/a'}"
             )
-            lines.append(
-                "- **Priority**: "
+            out.write(
+                "\n- **Priority**: "
                 f"{summary.priority} – {', '.join(summary.priority_reasons) or 'n/a'}"
             )
-            lines.append("- **Recommended Action**: " + summary.recommended_action)
+            out.write("\n- **Recommended Action**: " + summary.recommended_action)
             if summary.dependencies:
-                lines.append(
-                    "- **Dependencies**: "
+                out.write(
+                    "\n- **Dependencies**: "
                     + ", ".join(f"#{dep}" for dep in summary.dependencies)
                 )
             if summary.review_decision:
-                lines.append("- **Review Decision**: " + summary.review_decision)
+                out.write("\n- **Review Decision**: " + summary.review_decision)
             if summary.approvals or summary.change_requests:
-                lines.append(
-                    "- **Reviews**: "
+                out.write(
+                    "\n- **Reviews**: "
                     f"{summary.approvals} approvals, {summary.change_requests} change requests"
                 )
             if summary.reviewers_blocking:
                 joined = ", ".join(sorted(summary.reviewers_blocking))
-                lines.append("- **Blocking Reviewers**: " + joined)
+                out.write("\n- **Blocking Reviewers**: " + joined)
             if summary.mergeable_state:
-                lines.append("- **Mergeable State**: " + summary.mergeable_state)
+                out.write("\n- **Mergeable State**: " + summary.mergeable_state)
             if summary.conflicts:
-                conflict_lines = []
-                for other, files in sorted(summary.conflicts.items()):
-                    conflict_lines.append(f"#{other} ({len(files)} files)")
-                lines.append("- **Conflicts**: " + ", ".join(conflict_lines))
+                conflict_lines = [
+                    f"#{other} ({len(files)} files)"
+                    for other, files in sorted(summary.conflicts.items())
+                ]
+                out.write("\n- **Conflicts**: " + ", ".join(conflict_lines))
             if summary.body:
                 snippet = self._summarize_body(summary.body)
                 if snippet:
-                    lines.append("- **Summary**: " + snippet)
-            lines.append("")
-        return "\n".join(lines).rstrip()
+                    out.write("\n- **Summary**: " + snippet)
 
     def _summarize_body(self, body: str) -> str:
         cleaned = re.sub(r"`[^`]*`", "", body)
@@ -534,17 +602,19 @@ class PullRequestComparator:
         queue: deque[int] = deque(
             sorted(
                 [num for num, degree in indegree.items() if degree == 0],
-                key=lambda num: self._sort_key(self._find_summary(num, summaries)),
+                key=lambda num: self._find_summary(num, summaries)._sort_key_cache,
                 reverse=True,
             )
         )
         ordered: List[PullRequestSummary] = []
+        ordered_numbers: Set[int] = set()
         indegree_copy = indegree.copy()
 
         while queue:
             current = queue.popleft()
             summary = self._find_summary(current, summaries)
             ordered.append(summary)
+            ordered_numbers.add(current)
             for dependent in dependents.get(current, []):
                 indegree_copy[dependent] -= 1
                 if indegree_copy[dependent] == 0:
@@ -552,25 +622,23 @@ class PullRequestComparator:
                     queue = deque(
                         sorted(
                             list(queue),
-                            key=lambda num: self._sort_key(
-                                self._find_summary(num, summaries)
-                            ),
+                            key=lambda num: self._find_summary(
+                                num, summaries
+                            )._sort_key_cache,
                             reverse=True,
                         )
                     )
 
-        remaining = [s for s in summaries if s not in ordered]
-        remaining.sort(key=self._sort_key, reverse=True)
+        remaining = [s for s in summaries if s.number not in ordered_numbers]
+        remaining.sort(key=lambda summary: summary._sort_key_cache, reverse=True)
         ordered.extend(remaining)
         return ordered
 
     def _sort_key(self, summary: PullRequestSummary) -> Tuple[int, int, int]:
-        priority_rank = {"Critical": 3, "High": 2, "Medium": 1, "Low": 0}
-        risk_rank = {"Critical": 3, "High": 2, "Medium": 1, "Low": 0}
         state_rank = 1 if summary.is_open else 0
         return (
-            priority_rank.get(summary.priority, 1),
-            risk_rank.get(summary.risk_level, 1),
+            PRIORITY_RANK.get(summary.priority, 1),
+            RISK_RANK.get(summary.risk_level, 1),
             state_rank,
         )
 
@@ -583,6 +651,11 @@ class PullRequestComparator:
         raise ValueError(f"Unknown pull request #{number}")
 
 
+def summary_to_dict(summary: PullRequestSummary) -> dict:
+    """Serialize a summary for JSON output, omitting private cache fields."""
+    return {key: value for key, value in asdict(summary).items() if not key.startswith("_")}
+
+
 def load_json_file(path: str) -> Sequence[dict]:
     try:
         with open(path, "r", encoding="utf-8") as handle:
@@ -638,13 +711,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         summaries = comparator.fetch(args.numbers)
 
     if args.format == "json":
-        print(
-            json.dumps(
-                [asdict(summary) for summary in summaries],
-                indent=2,
-                ensure_ascii=False,
-            )
-        )
+        print(dumps_pretty([summary_to_dict(summary) for summary in summaries]).decode())
     elif args.format == "text":
         print(comparator.render_text(summaries))
     else:
@@ -3,33 +3,15 @@
 Complete all Protocol 02 requirements for Protocol 03 handoff
 """
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Tuple
 
-def check_protocol_02_artifacts():
-    """Check if all Protocol 02 artifacts exist"""
-    required = [
-        'client-discovery-form.md',
-        'scope-clarification.md', 
-        'communication-plan.md',
-        'timeline-discussion.md',
-        'discovery-recap.md'
-    ]
-    
-    base = Path('.artifacts/protocol-02')
-    missing = []
-    
-    for artifact in required:
-        if not (base / artifact).exists():
-            missing.append(artifact)
-    
-    return missing
-
-def create_client_reply():
-    """Create client-reply.md prerequisite"""
-    content = f"""---
+CLIENT_REPLY_TEMPLATE = """---
 **Client Communication**
-**Date**: {datetime.now().strftime('%Y-%m-%d')}
+**Date**: {today}
 ---
 
 # CLIENT REPLY TO PROPOSAL
@@ -52,25 +34,16 @@ We approve the proposal and are ready to proceed with the discovery session.
 **Approved By**: John Smith  
 **Title**: CTO  
 **Company**: TechCorp Inc.  
-**Date**: {datetime.now().strftime('%Y-%m-%d')}
+**Date**: {today}
 
 Best regards,
 John Smith
 TechCorp Inc.
 """
-    
-    Path('.artifacts/protocol-02/client-reply.md').write_text(content)
-    print("✅ Created: client-reply.md")
 
-def create_proposal_artifacts():
-    """Create Protocol 01 artifacts if missing"""
-    p01_dir = Path('.artifacts/protocol-01')
-    p01_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create PROPOSAL.md
-    proposal = f"""---
+PROPOSAL_TEMPLATE = """---
 **MASTER RAY™ Protocol 01 Artifact**
-**Date**: {datetime.now().strftime('%Y-%m-%d')}
+**Date**: {today}
 ---
 
 # PROJECT PROPOSAL: AI-DRIVEN WORKFLOW SYSTEM
@@ -87,7 +60,7 @@ Implementation of comprehensive 28-protocol AI-driven workflow system for comple
 ## Timeline & Budget
 - **Duration**: 10 weeks
 - **Budget**: $50,000 + 10% contingency
-- **Start Date**: {datetime.now().strftime('%Y-%m-%d')}
+- **Start Date**: {today}
 
 ## Deliverables
 1. Complete protocol implementation (Protocols 01-28)
@@ -97,53 +70,99 @@ Implementation of comprehensive 28-protocol AI-driven workflow system for comple
 
 **Status**: ACCEPTED ✅
 """
+
+# JSON artifacts are serialized once; only the quoted timestamp is filled per run
+ISO_PLACEHOLDER = "__ISO__"
+
+PROPOSAL_SUMMARY_TEMPLATE = json.dumps({
+    "proposal_id": "PROP-2025-001",
+    "client": "TechCorp Inc.",
+    "project": "AI-Driven Workflow System",
+    "budget": 50000,
+    "duration_weeks": 10,
+    "status": "accepted",
+    "acceptance_date": ISO_PLACEHOLDER
+}, indent=2)
+
+COMPLETION_MANIFEST_TEMPLATE = json.dumps({
+    "protocol": "02",
+    "status": "COMPLETE",
+    "completion_date": ISO_PLACEHOLDER,
+    "all_gates_passed": True,
+    "client_approved": True,
+    "ready_for_protocol_03": True,
+    "artifacts_validated": [
+        "client-discovery-form.md",
+        "scope-clarification.md",
+        "communication-plan.md",
+        "timeline-discussion.md",
+        "discovery-recap.md",
+        "client-reply.md"
+    ],
+    "quality_gates": {
+        "gate_1": "PASSED",
+        "gate_2": "PASSED",
+        "gate_3": "PASSED",
+        "gate_4": "PASSED"
+    }
+}, indent=2)
+
+def check_protocol_02_artifacts():
+    """Check if all Protocol 02 artifacts exist"""
+    required = [
+        'client-discovery-form.md',
+        'scope-clarification.md', 
+        'communication-plan.md',
+        'timeline-discussion.md',
+        'discovery-recap.md'
+    ]
     
-    (p01_dir / 'PROPOSAL.md').write_text(proposal)
-    print("✅ Created: PROPOSAL.md")
+    base = Path('.artifacts/protocol-02')
     
-    # Create proposal-summary.json
-    summary = {
-        "proposal_id": "PROP-2025-001",
-        "client": "TechCorp Inc.",
-        "project": "AI-Driven Workflow System",
-        "budget": 50000,
-        "duration_weeks": 10,
-        "status": "accepted",
-        "acceptance_date": datetime.now().isoformat()
-    }
+    # One directory listing instead of a stat per artifact
+    try:
+        with os.scandir(base) as entries:
+            present = {entry.name for entry in entries}
+    except FileNotFoundError:
+        present = set()
     
-    (p01_dir / 'proposal-summary.json').write_text(json.dumps(summary, indent=2))
-    print("✅ Created: proposal-summary.json")
-
-def create_protocol_02_completion_manifest():
-    """Create completion manifest for Protocol 02"""
-    manifest = {
-        "protocol": "02",
-        "status": "COMPLETE",
-        "completion_date": datetime.now().isoformat(),
-        "all_gates_passed": True,
-        "client_approved": True,
-        "ready_for_protocol_03": True,
-        "artifacts_validated": [
-            "client-discovery-form.md",
-            "scope-clarification.md",
-            "communication-plan.md",
-            "timeline-discussion.md",
-            "discovery-recap.md",
-            "client-reply.md"
-        ],
-        "quality_gates": {
-            "gate_1": "PASSED",
-            "gate_2": "PASSED",
-            "gate_3": "PASSED",
-            "gate_4": "PASSED"
-        }
-    }
+    return [artifact for artifact in required if artifact not in present]
+
+def fill_json_template(template: str, ctx: Dict[str, str]) -> str:
+    """Substitute the run timestamp into a pre-serialized JSON template"""
+    return template.replace(json.dumps(ISO_PLACEHOLDER), json.dumps(ctx['iso']))
+
+def create_client_reply(ctx: Dict[str, str]) -> List[Tuple[Path, str]]:
+    """Build client-reply.md prerequisite"""
+    content = CLIENT_REPLY_TEMPLATE.format_map(ctx)
     
-    Path('.artifacts/protocol-02/completion-manifest.json').write_text(
-        json.dumps(manifest, indent=2)
-    )
-    print("✅ Created: completion-manifest.json")
+    return [(Path('.artifacts/protocol-02/client-reply.md'), content)]
+
+def create_proposal_artifacts(ctx: Dict[str, str]) -> List[Tuple[Path, str]]:
+    """Build Protocol 01 artifacts"""
+    p01_dir = Path('.artifacts/protocol-01')
+    p01_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Create PROPOSAL.md
+    proposal = PROPOSAL_TEMPLATE.format_map(ctx)
+    
+    return [
+        (p01_dir / 'PROPOSAL.md', proposal),
+        (p01_dir / 'proposal-summary.json', fill_json_template(PROPOSAL_SUMMARY_TEMPLATE, ctx)),
+    ]
+
+def create_protocol_02_completion_manifest(ctx: Dict[str, str]) -> List[Tuple[Path, str]]:
+    """Build completion manifest for Protocol 02"""
+    manifest = fill_json_template(COMPLETION_MANIFEST_TEMPLATE, ctx)
+    
+    return [(Path('.artifacts/protocol-02/completion-manifest.json'), manifest)]
+
+def write_artifacts(writes: List[Tuple[Path, str]]):
+    """Write all artifact payloads concurrently, then report them in order"""
+    with ThreadPoolExecutor(max_workers=len(writes)) as executor:
+        list(executor.map(lambda item: item[0].write_bytes(item[1].encode('utf-8')), writes))
+    for path, _ in writes:
+        print(f"✅ Created: {path.name}")
 
 def main():
     print("\n[MASTER RAY™ | COMPLETING PROTOCOL 02 REQUIREMENTS]\n")
@@ -158,9 +177,14 @@ def main():
     
     # Create prerequisites
     print("\nCreating prerequisites...")
-    create_client_reply()
-    create_proposal_artifacts()
-    create_protocol_02_completion_manifest()
+    now = datetime.now()
+    ctx = {'today': now.strftime('%Y-%m-%d'), 'iso': now.isoformat()}
+    writes = (
+        create_client_reply(ctx)
+        + create_proposal_artifacts(ctx)
+        + create_protocol_02_completion_manifest(ctx)
+    )
+    write_artifacts(writes)
     
     print("\n[PROTOCOL 02 REQUIREMENTS COMPLETE]")
     print("\n✅ Ready to proceed to Protocol 03: Project Brief Creation")
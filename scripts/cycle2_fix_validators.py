@@ -5,30 +5,91 @@ Cycle 2: Fix critical validator gaps
 - Enhance script documentation (for scripts validator)
 """
 
+import hashlib
+import io
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
+from json_io import load_cache, save_cache, source_key
 
-def inject_learning_keywords_evidence(content: str) -> str:
-    """Add learning mechanism keywords to EVIDENCE SUMMARY section."""
-    # Find EVIDENCE SUMMARY section
-    evidence_match = re.search(
-        r'(## (?:\d+\.\s+)?EVIDENCE SUMMARY.*?)(?=\n##|\Z)',
-        content,
-        re.DOTALL
-    )
-    
-    if not evidence_match:
-        print("  ⚠️  No EVIDENCE SUMMARY section found")
-        return content
-    
-    evidence_section = evidence_match.group(1)
-    
+SECTIONS_RE = re.compile(
+    r'## (?:\d+\.\s+)?(?P<kind>EVIDENCE SUMMARY|HANDOFF CHECKLIST|AUTOMATION HOOKS).*?(?=\n##|\Z)',
+    re.DOTALL
+)
+METRICS_HEADER_RE = re.compile(r'(### (?:Quality Metrics|Generated Artifacts):?)')
+HANDOFF_HEADER_RE = re.compile(r'(### (?:Handoff to Protocol \d+|Pre-Handoff Validation):)')
+HOOKS_HEADER_RE = re.compile(r'(## (?:\d+\.\s+)?AUTOMATION HOOKS\s*\n)')
+# Opening fence of a closed bash block that runs a python command and has no
+# "# Owner:" comment yet
+BASH_PYTHON_BLOCK_RE = re.compile(
+    r'```bash(?=\n)'
+    r'(?!(?:(?!```).)*?# Owner:)'
+    r'(?=(?:(?!```).)*?\npython.*?```)',
+    re.DOTALL
+)
+COMMAND_ENHANCEMENT = """
+# Exit codes: 0=success, 1=fail, 2=warning
+# Logs: Output logged to corresponding .log file
+# Owner: Protocol automation team
+# Registry: scripts/script-registry.json"""
+
+MAX_WORKERS = 8
+CACHE_SECTION = 'cycle2'
+CACHE_VERSION = 1
+
+_log_buffer: ContextVar[Optional[io.StringIO]] = ContextVar("log_buffer", default=None)
+
+
+def log(message: str = "") -> None:
+    """Print a progress message, or collect it when running inside a protocol worker."""
+    buffer = _log_buffer.get()
+    if buffer is None:
+        print(message)
+    else:
+        buffer.write(message + '\n')
+
+
+def _run_buffered(func: Callable[[Path], bool], protocol_path: Path) -> Tuple[bool, str]:
+    """Run ``func`` with its log output captured so parallel workers don't interleave."""
+    buffer = io.StringIO()
+    token = _log_buffer.set(buffer)
+    try:
+        return func(protocol_path), buffer.getvalue()
+    finally:
+        _log_buffer.reset(token)
+
+
+def content_digest(content: str) -> str:
+    """Return a short content hash used as the cycle cache key."""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def load_cycle_cache(cache_path: Path) -> Dict[str, str]:
+    """Load the protocol hashes recorded by the last run of this script.
+
+    Entries are discarded when the script itself has changed since then.
+    """
+    return load_cache(cache_path, source_key(CACHE_VERSION, Path(__file__)), CACHE_SECTION)
+
+
+def save_cycle_cache(cache_path: Path, cache: Dict[str, str]) -> None:
+    """Record processed protocol hashes, keeping other scripts' entries."""
+    save_cache(cache_path, source_key(CACHE_VERSION, Path(__file__)), CACHE_SECTION, dict(sorted(cache.items())))
+
+
+def inject_learning_keywords_evidence(evidence_section: str) -> str:
+    """Add learning mechanism keywords to an EVIDENCE SUMMARY section."""
     # Check if already has learning keywords
-    if 'feedback' in evidence_section.lower() and 'improvement' in evidence_section.lower():
-        print("  ⏭️  Learning keywords already present in EVIDENCE")
-        return content
+    lowered = evidence_section.lower()
+    if 'feedback' in lowered and 'improvement' in lowered:
+        log("  ⏭️  Learning keywords already present in EVIDENCE")
+        return evidence_section
     
     # Add learning mechanisms paragraph before quality metrics table
     learning_paragraph = """
@@ -46,10 +107,8 @@ def inject_learning_keywords_evidence(content: str) -> str:
 """
     
     # Insert before "### Quality Metrics" or "### Generated Artifacts" table
-    metrics_pattern = r'(### (?:Quality Metrics|Generated Artifacts):?)'
-    if re.search(metrics_pattern, evidence_section):
-        new_evidence = re.sub(
-            metrics_pattern,
+    if METRICS_HEADER_RE.search(evidence_section):
+        new_evidence = METRICS_HEADER_RE.sub(
             f'{learning_paragraph.strip()}\n\n\\1',
             evidence_section,
             count=1
@@ -58,31 +117,17 @@ def inject_learning_keywords_evidence(content: str) -> str:
         # If no table found, append to end of section
         new_evidence = evidence_section + '\n' + learning_paragraph
     
-    # Replace in content
-    content = content.replace(evidence_section, new_evidence)
-    print("  ✅ Added learning keywords to EVIDENCE")
-    return content
+    log("  ✅ Added learning keywords to EVIDENCE")
+    return new_evidence
 
 
-def inject_learning_keywords_handoff(content: str) -> str:
-    """Add learning mechanism keywords to HANDOFF CHECKLIST section."""
-    # Find HANDOFF CHECKLIST section
-    handoff_match = re.search(
-        r'(## (?:\d+\.\s+)?HANDOFF CHECKLIST.*?)(?=\n##|\Z)',
-        content,
-        re.DOTALL
-    )
-    
-    if not handoff_match:
-        print("  ⚠️  No HANDOFF CHECKLIST section found")
-        return content
-    
-    handoff_section = handoff_match.group(1)
-    
+def inject_learning_keywords_handoff(handoff_section: str) -> str:
+    """Add learning mechanism keywords to a HANDOFF CHECKLIST section."""
     # Check if already has learning keywords
-    if 'feedback' in handoff_section.lower() and 'lessons' in handoff_section.lower():
-        print("  ⏭️  Learning keywords already present in HANDOFF")
-        return content
+    lowered = handoff_section.lower()
+    if 'feedback' in lowered and 'lessons' in lowered:
+        log("  ⏭️  Learning keywords already present in HANDOFF")
+        return handoff_section
     
     # Add continuous improvement checklist items
     improvement_checklist = """
@@ -98,11 +143,9 @@ def inject_learning_keywords_handoff(content: str) -> str:
 """
     
     # Insert before final handoff statement or at end
-    handoff_pattern = r'(### (?:Handoff to Protocol \d+|Pre-Handoff Validation):)'
-    if re.search(handoff_pattern, handoff_section):
+    if HANDOFF_HEADER_RE.search(handoff_section):
         # Insert before first handoff subsection
-        new_handoff = re.sub(
-            handoff_pattern,
+        new_handoff = HANDOFF_HEADER_RE.sub(
             f'{improvement_checklist.strip()}\n\n\\1',
             handoff_section,
             count=1
@@ -111,31 +154,16 @@ def inject_learning_keywords_handoff(content: str) -> str:
         # Append to end if no subsections found
         new_handoff = handoff_section + '\n' + improvement_checklist
     
-    # Replace in content
-    content = content.replace(handoff_section, new_handoff)
-    print("  ✅ Added learning keywords to HANDOFF")
-    return content
+    log("  ✅ Added learning keywords to HANDOFF")
+    return new_handoff
 
 
-def enhance_automation_hooks(content: str) -> str:
-    """Enhance AUTOMATION HOOKS section with detailed command documentation."""
-    # Find AUTOMATION HOOKS section
-    hooks_match = re.search(
-        r'(## (?:\d+\.\s+)?AUTOMATION HOOKS.*?)(?=\n##|\Z)',
-        content,
-        re.DOTALL
-    )
-    
-    if not hooks_match:
-        print("  ⚠️  No AUTOMATION HOOKS section found")
-        return content
-    
-    hooks_section = hooks_match.group(1)
-    
+def enhance_automation_hooks(hooks_section: str) -> str:
+    """Enhance an AUTOMATION HOOKS section with detailed command documentation."""
     # Check if already enhanced (has "Registry Reference")
     if 'Registry Reference' in hooks_section or '# Exit codes:' in hooks_section:
-        print("  ⏭️  AUTOMATION HOOKS already enhanced")
-        return content
+        log("  ⏭️  AUTOMATION HOOKS already enhanced")
+        return hooks_section
     
     # Add registry reference if missing
     if '**Registry Reference:**' not in hooks_section:
@@ -145,93 +173,118 @@ def enhance_automation_hooks(content: str) -> str:
 
 """
         # Insert after section header
-        hooks_section = re.sub(
-            r'(## (?:\d+\.\s+)?AUTOMATION HOOKS\s*\n)',
+        hooks_section = HOOKS_HEADER_RE.sub(
             f'\\1{registry_header}',
             hooks_section,
             count=1
         )
     
-    # Enhance script commands with exit codes and metadata
-    def enhance_command(match):
-        """Add exit codes, logs, and ownership to commands."""
-        cmd = match.group(0)
-        
-        # Skip if already enhanced
-        if '# Exit codes:' in cmd or '# Owner:' in cmd:
-            return cmd
-        
-        # Add enhancement comment block after bash block start
-        if '```bash' in cmd and '\npython' in cmd:
-            enhancement = """
-# Exit codes: 0=success, 1=fail, 2=warning
-# Logs: Output logged to corresponding .log file
-# Owner: Protocol automation team
-# Registry: scripts/script-registry.json"""
-            
-            cmd = cmd.replace('```bash\n', f'```bash{enhancement}\n')
-        
-        return cmd
-    
-    # Apply enhancement to all bash blocks
-    hooks_section = re.sub(
-        r'```bash\n.*?```',
-        enhance_command,
-        hooks_section,
-        flags=re.DOTALL
-    )
+    # Add exit codes, logs, and ownership to bash blocks running python commands
+    hooks_section = BASH_PYTHON_BLOCK_RE.sub('```bash' + COMMAND_ENHANCEMENT, hooks_section)
     
-    # Replace in content
-    content = content.replace(hooks_match.group(1), hooks_section)
-    print("  ✅ Enhanced AUTOMATION HOOKS")
-    return content
+    log("  ✅ Enhanced AUTOMATION HOOKS")
+    return hooks_section
+
+
+# Section fixers in the order they are applied and reported
+SECTION_FIXES = (
+    ('EVIDENCE SUMMARY', inject_learning_keywords_evidence),
+    ('HANDOFF CHECKLIST', inject_learning_keywords_handoff),
+    ('AUTOMATION HOOKS', enhance_automation_hooks),
+)
 
 
-def fix_protocol(protocol_path: Path) -> bool:
-    """Apply Cycle 2 fixes to a protocol."""
+def apply_section_fixes(content: str) -> str:
+    """Locate every Cycle 2 section in one scan, fix each, and rebuild content once."""
+    sections = {}
+    for match in SECTIONS_RE.finditer(content):
+        sections.setdefault(match.group('kind'), match)
+    
+    replacements = []
+    for kind, fixer in SECTION_FIXES:
+        match = sections.get(kind)
+        if match is None:
+            log(f"  ⚠️  No {kind} section found")
+            continue
+        replacements.append((match.start(), match.end(), fixer(match.group(0))))
+    
+    pieces = []
+    position = 0
+    for start, end, section in sorted(replacements):
+        pieces.append(content[position:start])
+        pieces.append(section)
+        position = end
+    pieces.append(content[position:])
+    return ''.join(pieces)
+
+
+def fix_protocol(protocol_path: Path, cache: Optional[Dict[str, str]] = None) -> bool:
+    """Apply Cycle 2 fixes to a protocol.
+
+    ``cache`` maps protocol names to the hash of content a previous run left
+    unchanged; files whose content still matches are skipped.
+    """
     try:
-        content = protocol_path.read_text()
+        content = protocol_path.read_text(encoding='utf-8')
         original_content = content
         
-        print(f"\n📋 Processing: {protocol_path.name}")
-        
-        # Fix 1: Inject learning keywords into EVIDENCE
-        content = inject_learning_keywords_evidence(content)
+        log(f"\n📋 Processing: {protocol_path.name}")
         
-        # Fix 2: Inject learning keywords into HANDOFF
-        content = inject_learning_keywords_handoff(content)
+        if cache is not None and cache.get(protocol_path.name) == content_digest(content):
+            log(f"  ⏭️  SKIPPED: Unchanged since last run")
+            return False
         
-        # Fix 3: Enhance AUTOMATION HOOKS
-        content = enhance_automation_hooks(content)
+        # Fixes 1-3: learning keywords in EVIDENCE/HANDOFF, enhanced AUTOMATION HOOKS
+        content = apply_section_fixes(content)
         
         # Write if changes made
         if content != original_content:
-            protocol_path.write_text(content)
-            print(f"  ✅ SAVED: {protocol_path.name}")
+            protocol_path.write_bytes(content.encode('utf-8'))
+            log(f"  ✅ SAVED: {protocol_path.name}")
             return True
         else:
-            print(f"  ⏭️  SKIPPED: No changes needed")
+            log(f"  ⏭️  SKIPPED: No changes needed")
+            # Only no-op content is cached: a pass that changed the file may
+            # still change it again on the next run
+            if cache is not None:
+                cache[protocol_path.name] = content_digest(content)
             return False
             
     except Exception as e:
-        print(f"  ❌ ERROR: {e}")
+        log(f"  ❌ ERROR: {e}")
         return False
 
 
+def find_protocol_files(protocols_dir: Path, protocol_numbers: Sequence[str]) -> List[Path]:
+    """List ``NN-*.md`` protocol files with a single directory scan.
+
+    With ``protocol_numbers`` the result follows their order; otherwise every
+    two-digit protocol is returned sorted by name.
+    """
+    by_number: Dict[str, List[Path]] = {}
+    with os.scandir(protocols_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            number, sep, _ = name.partition('-')
+            if sep and name.endswith('.md') and entry.is_file():
+                by_number.setdefault(number, []).append(Path(entry.path))
+    if protocol_numbers:
+        return [path for num in dict.fromkeys(protocol_numbers) for path in sorted(by_number.get(num, []))]
+    return sorted(
+        path
+        for number, paths in by_number.items()
+        if len(number) == 2 and number.isdigit()
+        for path in paths
+    )
+
+
 def main():
     """Main execution."""
     protocols_dir = Path(__file__).parent.parent / '.cursor' / 'ai-driven-workflow'
     
-    if len(sys.argv) > 1:
-        # Process specific protocols
-        protocol_numbers = [num.zfill(2) for num in sys.argv[1:]]
-        protocol_files = []
-        for num in protocol_numbers:
-            files = list(protocols_dir.glob(f"{num}-*.md"))
-            protocol_files.extend(files)
-    else:
-        # Process all protocols
-        protocol_files = sorted(protocols_dir.glob("[0-9][0-9]-*.md"))
+    # Process specific protocols when numbers are given, otherwise all of them
+    protocol_numbers = tuple(num.zfill(2) for num in sys.argv[1:])
+    protocol_files = find_protocol_files(protocols_dir, protocol_numbers)
     
     if not protocol_files:
         print("❌ No protocol files found")
@@ -239,10 +292,19 @@ def main():
     
     print(f"🎯 Target: {len(protocol_files)} protocols")
     
+    # Hashes of already-processed protocols, so unchanged files are skipped on re-runs
+    cache_path = protocols_dir.parent.parent / '.artifacts' / '.cycle-cache.json'
+    cache = load_cycle_cache(cache_path)
+    
     fixed_count = 0
-    for protocol_file in protocol_files:
-        if fix_protocol(protocol_file):
-            fixed_count += 1
+    worker = partial(_run_buffered, partial(fix_protocol, cache=cache))
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(protocol_files))) as executor:
+        for fixed, output in executor.map(worker, protocol_files):
+            sys.stdout.write(output)
+            if fixed:
+                fixed_count += 1
+    
+    save_cycle_cache(cache_path, cache)
     
     print(f"\n📊 SUMMARY: Fixed {fixed_count}/{len(protocol_files)} protocols")
     print("\n🔄 Next: Run validators-system/scripts/validate_all_protocols.py --all --report")
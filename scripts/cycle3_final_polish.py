@@ -4,42 +4,99 @@ Cycle 3: Final Polish to Reach ≥0.95
 Addresses remaining validator gaps systematically.
 """
 
+import hashlib
+import io
+import json
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
 
+from json_io import load_cache, save_cache, source_key
 
-def enhance_role_constraints(content: str) -> str:
-    """Add more [CRITICAL], [MUST], [GUIDELINE] markers to AI ROLE sections."""
-    role_match = re.search(
-        r'(## (?:\d+\.\s+)?AI ROLE AND MISSION.*?)(?=\n##|\Z)',
-        content,
-        re.DOTALL
-    )
-    
-    if not role_match:
-        print("  ⚠️  No AI ROLE section found")
-        return content
-    
-    role_section = role_match.group(1)
-    
+# Zero-width so sections that overlap (e.g. an artifacts table running past a
+# ## header) are still all reported by one finditer pass.
+SECTIONS_RE = re.compile(
+    r'(?=(?P<role>## (?:\d+\.\s+)?AI ROLE AND MISSION.*?(?=\n##|\Z))'
+    r'|(?P<artifacts>### Generated Artifacts:.*?(?=###|\Z))'
+    r'|(?P<handoff>### Pre-Handoff Validation:.*?(?=###|\n##|\Z))'
+    r'|(?P<comm>## (?:\d+\.\s+)?COMMUNICATION PROTOCOLS.*?(?=\n##|\Z)))',
+    re.DOTALL
+)
+CRITICAL_MARKER_RE = re.compile(r'\[CRITICAL\]', re.IGNORECASE)
+MUST_MARKER_RE = re.compile(r'\[MUST\]', re.IGNORECASE)
+DO_NOT_RE = re.compile(r'(\*\*🚫 )(DO NOT )')
+ARTIFACTS_NEXT_SECTION_RE = re.compile(r'(###\s+(?:Quality Metrics|Archival|Downstream))')
+CHECKLIST_ITEM_RE = re.compile(r'- \[ \]')
+HANDOFF_INSERT_RE = re.compile(r'(- \[ \] Communication log complete\s*\n\s*)(###\s+Handoff to Protocol)')
+PHASE_START_RE = re.compile(r'(\[MASTER RAY™ \| PHASE \d+ START\])')
+STATUS_ANNOUNCEMENTS_RE = re.compile(r'(### Status Announcements:.*?```\s*\n)', re.DOTALL)
+SCRIPT_REFERENCE_RE = re.compile(r'python3?\s+scripts/([\w_-]+\.py)')
+
+MAX_WORKERS = 8
+CACHE_SECTION = 'cycle3'
+CACHE_VERSION = 1
+
+_log_buffer: ContextVar[Optional[io.StringIO]] = ContextVar("log_buffer", default=None)
+
+
+def log(message: str = "") -> None:
+    """Print a progress message, or collect it when running inside a protocol worker."""
+    buffer = _log_buffer.get()
+    if buffer is None:
+        print(message)
+    else:
+        buffer.write(message + '\n')
+
+
+def _run_buffered(
+    func: Callable[..., Tuple[bool, Optional[str]]], protocol_path: Path, *args
+) -> Tuple[Tuple[bool, Optional[str]], str]:
+    """Run ``func`` with its log output captured so parallel workers don't interleave."""
+    buffer = io.StringIO()
+    token = _log_buffer.set(buffer)
+    try:
+        return func(protocol_path, *args), buffer.getvalue()
+    finally:
+        _log_buffer.reset(token)
+
+
+def content_digest(content: str) -> str:
+    """Return a short content hash used as the cycle cache key."""
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def load_cycle_cache(cache_path: Path) -> Dict[str, str]:
+    """Load the protocol hashes recorded by the last run of this script.
+
+    Entries are discarded when the script itself has changed since then.
+    """
+    return load_cache(cache_path, source_key(CACHE_VERSION, Path(__file__)), CACHE_SECTION)
+
+
+def save_cycle_cache(cache_path: Path, cache: Dict[str, str]) -> None:
+    """Record processed protocol hashes, keeping other scripts' entries."""
+    save_cache(cache_path, source_key(CACHE_VERSION, Path(__file__)), CACHE_SECTION, dict(sorted(cache.items())))
+
+
+def enhance_role_constraints(role_section: str) -> str:
+    """Add more [CRITICAL], [MUST], [GUIDELINE] markers to an AI ROLE section."""
     # Count existing markers
-    critical_count = len(re.findall(r'\[CRITICAL\]', role_section, re.IGNORECASE))
-    must_count = len(re.findall(r'\[MUST\]', role_section, re.IGNORECASE))
+    critical_count = len(CRITICAL_MARKER_RE.findall(role_section))
+    must_count = len(MUST_MARKER_RE.findall(role_section))
     
     if critical_count >= 1 and must_count >= 2:
-        print("  ⏭️  Role constraints already sufficient")
-        return content
+        log("  ⏭️  Role constraints already sufficient")
+        return role_section
     
     # Add explicit constraint section if missing
     if '[CRITICAL]' not in role_section and 'DO NOT' in role_section:
         # Enhance existing DO NOT statements
-        enhanced_role = re.sub(
-            r'(\*\*🚫 )(DO NOT )',
-            r'\1[CRITICAL] \2',
-            role_section
-        )
+        enhanced_role = DO_NOT_RE.sub(r'\1[CRITICAL] \2', role_section)
         
         # Add behavioral guidelines if missing
         if '[MUST]' not in enhanced_role:
@@ -54,32 +111,19 @@ def enhance_role_constraints(content: str) -> str:
             # Insert before closing of section
             enhanced_role = enhanced_role.rstrip() + guidelines + '\n'
         
-        content = content.replace(role_section, enhanced_role)
-        print("  ✅ Enhanced role constraints")
-        return content
+        log("  ✅ Enhanced role constraints")
+        return enhanced_role
     
-    print("  ⏭️  Role section structure doesn't match pattern")
-    return content
+    log("  ⏭️  Role section structure doesn't match pattern")
+    return role_section
 
 
-def add_evidence_traceability(content: str) -> str:
-    """Add traceability links and verification owners to EVIDENCE sections."""
-    evidence_match = re.search(
-        r'(### Generated Artifacts:.*?)(###|\Z)',
-        content,
-        re.DOTALL
-    )
-    
-    if not evidence_match:
-        print("  ⚠️  No Generated Artifacts table found")
-        return content
-    
-    artifacts_section = evidence_match.group(1)
-    
+def add_evidence_traceability(artifacts_section: str) -> str:
+    """Add traceability links and verification owners to a Generated Artifacts section."""
     # Check if traceability already present
     if 'Traceability' in artifacts_section or 'upstream_protocols' in artifacts_section:
-        print("  ⏭️  Traceability already present")
-        return content
+        log("  ⏭️  Traceability already present")
+        return artifacts_section
     
     # Add traceability subsection
     traceability = """
@@ -104,10 +148,8 @@ def add_evidence_traceability(content: str) -> str:
 """
     
     # Insert before next section or end
-    next_section_pattern = r'(###\s+(?:Quality Metrics|Archival|Downstream))'
-    if re.search(next_section_pattern, artifacts_section):
-        new_artifacts = re.sub(
-            next_section_pattern,
+    if ARTIFACTS_NEXT_SECTION_RE.search(artifacts_section):
+        new_artifacts = ARTIFACTS_NEXT_SECTION_RE.sub(
             f'{traceability}\\1',
             artifacts_section,
             count=1
@@ -115,31 +157,18 @@ def add_evidence_traceability(content: str) -> str:
     else:
         new_artifacts = artifacts_section.rstrip() + '\n' + traceability
     
-    content = content.replace(artifacts_section, new_artifacts)
-    print("  ✅ Added evidence traceability")
-    return content
+    log("  ✅ Added evidence traceability")
+    return new_artifacts
 
 
-def expand_handoff_checklist(content: str) -> str:
-    """Expand HANDOFF CHECKLIST to 8+ items with verification details."""
-    handoff_match = re.search(
-        r'(### Pre-Handoff Validation:.*?)(###|\n##|\Z)',
-        content,
-        re.DOTALL
-    )
-    
-    if not handoff_match:
-        print("  ⚠️  No Pre-Handoff Validation found")
-        return content
-    
-    checklist_section = handoff_match.group(1)
-    
+def expand_handoff_checklist(checklist_section: str) -> str:
+    """Expand a Pre-Handoff Validation checklist to 8+ items with verification details."""
     # Count existing items
-    item_count = len(re.findall(r'- \[ \]', checklist_section))
+    item_count = len(CHECKLIST_ITEM_RE.findall(checklist_section))
     
     if item_count >= 8:
-        print("  ⏭️  Handoff checklist already has 8+ items")
-        return content
+        log("  ⏭️  Handoff checklist already has 8+ items")
+        return checklist_section
     
     # Add comprehensive validation items
     additional_items = """
@@ -152,46 +181,27 @@ def expand_handoff_checklist(content: str) -> str:
 """
     
     # Insert additional items before "### Handoff to Protocol" section
-    handoff_pattern = r'(- \[ \] Communication log complete\s*\n\s*)(###\s+Handoff to Protocol)'
-    if re.search(handoff_pattern, checklist_section):
-        new_checklist = re.sub(
-            handoff_pattern,
+    if HANDOFF_INSERT_RE.search(checklist_section):
+        new_checklist = HANDOFF_INSERT_RE.sub(
             f'\\1{additional_items}\n\\2',
             checklist_section
         )
-        content = content.replace(checklist_section, new_checklist)
-        print(f"  ✅ Expanded handoff checklist (was {item_count}, added 6 more)")
-        return content
+        log(f"  ✅ Expanded handoff checklist (was {item_count}, added 6 more)")
+        return new_checklist
     
-    print("  ⏭️  Checklist structure doesn't match expected pattern")
-    return content
+    log("  ⏭️  Checklist structure doesn't match expected pattern")
+    return checklist_section
 
 
-def enhance_communication_templates(content: str) -> str:
-    """Add phase transitions and time estimates to communication templates."""
-    comm_match = re.search(
-        r'(## (?:\d+\.\s+)?COMMUNICATION PROTOCOLS.*?)(?=\n##|\Z)',
-        content,
-        re.DOTALL
-    )
-    
-    if not comm_match:
-        print("  ⚠️  No COMMUNICATION PROTOCOLS section found")
-        return content
-    
-    comm_section = comm_match.group(1)
-    
+def enhance_communication_templates(comm_section: str) -> str:
+    """Add phase transitions and time estimates to a COMMUNICATION PROTOCOLS section."""
     # Check if already enhanced
     if 'time estimate' in comm_section.lower() and 'PHASE 1 COMPLETE' in comm_section:
-        print("  ⏭️  Communication templates already enhanced")
-        return content
+        log("  ⏭️  Communication templates already enhanced")
+        return comm_section
     
     # Add time estimates to status announcements
-    enhanced_comm = re.sub(
-        r'(\[MASTER RAY™ \| PHASE \d+ START\])',
-        r'\1 (Est. time: [X] minutes)',
-        comm_section
-    )
+    enhanced_comm = PHASE_START_RE.sub(r'\1 (Est. time: [X] minutes)', comm_section)
     
     # Add phase completion announcements if missing
     if 'PHASE 1 COMPLETE' not in enhanced_comm and 'PHASE 1 START' in enhanced_comm:
@@ -206,43 +216,73 @@ def enhance_communication_templates(content: str) -> str:
 ```
 """
         # Insert after Status Announcements section
-        enhanced_comm = re.sub(
-            r'(### Status Announcements:.*?```\s*\n)',
+        enhanced_comm = STATUS_ANNOUNCEMENTS_RE.sub(
             f'\\1{phase_completions}',
             enhanced_comm,
-            flags=re.DOTALL,
             count=1
         )
     
     if enhanced_comm != comm_section:
-        content = content.replace(comm_section, enhanced_comm)
-        print("  ✅ Enhanced communication templates")
-        return content
+        log("  ✅ Enhanced communication templates")
+        return enhanced_comm
     
-    print("  ⏭️  Communication section doesn't need changes")
-    return content
+    log("  ⏭️  Communication section doesn't need changes")
+    return comm_section
 
 
-def register_missing_scripts(protocol_id: str, content: str, registry_path: Path) -> bool:
-    """Register referenced scripts in script-registry.json."""
-    import json
-    
-    # Extract script references from AUTOMATION HOOKS
-    script_pattern = r'python3?\s+scripts/([\w_-]+\.py)'
-    scripts = set(re.findall(script_pattern, content))
-    
-    if not scripts:
-        print("  ⏭️  No script references found")
-        return False
-    
-    # Load registry
-    try:
-        registry = json.loads(registry_path.read_text())
-    except Exception as e:
-        print(f"  ❌ Error loading registry: {e}")
-        return False
+# Section fixers in the order they are applied and reported
+SECTION_FIXES = (
+    ('role', enhance_role_constraints, "No AI ROLE section found"),
+    ('artifacts', add_evidence_traceability, "No Generated Artifacts table found"),
+    ('handoff', expand_handoff_checklist, "No Pre-Handoff Validation found"),
+    ('comm', enhance_communication_templates, "No COMMUNICATION PROTOCOLS section found"),
+)
+
+
+def locate_sections(content: str) -> Dict[str, re.Match]:
+    """Map each Cycle 3 section kind to its first match in ``content``."""
+    sections: Dict[str, re.Match] = {}
+    for match in SECTIONS_RE.finditer(content):
+        sections.setdefault(match.lastgroup, match)
+    return sections
+
+
+def apply_section_fixes(content: str) -> str:
+    """Fix every Cycle 3 section found by a single scan and rebuild content once."""
+    sections = locate_sections(content)
+    spans = sorted(match.span(kind) for kind, match in sections.items())
+    if any(start < previous_end for (_, previous_end), (start, _) in zip(spans, spans[1:])):
+        # Overlapping sections: fix one at a time so each sees the previous edits
+        for kind, fixer, missing_message in SECTION_FIXES:
+            match = locate_sections(content).get(kind)
+            if match is None:
+                log(f"  ⚠️  {missing_message}")
+                continue
+            start, end = match.span(kind)
+            content = content[:start] + fixer(match.group(kind)) + content[end:]
+        return content
     
-    # Check which scripts are missing
+    replacements = []
+    for kind, fixer, missing_message in SECTION_FIXES:
+        match = sections.get(kind)
+        if match is None:
+            log(f"  ⚠️  {missing_message}")
+            continue
+        start, end = match.span(kind)
+        replacements.append((start, end, fixer(match.group(kind))))
+    
+    pieces = []
+    position = 0
+    for start, end, section in sorted(replacements):
+        pieces.append(content[position:start])
+        pieces.append(section)
+        position = end
+    pieces.append(content[position:])
+    return ''.join(pieces)
+
+
+def collect_registered_scripts(registry: Dict) -> Set[str]:
+    """Flatten script-registry.json into the set of registered script filenames."""
     registered_scripts = set()
     for category in registry.values():
         if isinstance(category, dict):
@@ -251,11 +291,27 @@ def register_missing_scripts(protocol_id: str, content: str, registry_path: Path
                     registered_scripts.add(value.replace('scripts/', ''))
                 elif isinstance(value, list):
                     registered_scripts.update([v.replace('scripts/', '') for v in value if isinstance(v, str) and v.startswith('scripts/')])
+    return registered_scripts
+
+
+def register_missing_scripts(protocol_id: str, content: str, registry: Dict, registered_scripts: Set[str]) -> bool:
+    """Register referenced scripts in the loaded script registry.
+
+    ``registry`` and ``registered_scripts`` are updated in place; the caller
+    writes the registry back once all protocols have been processed.
+    """
+    # Extract script references from AUTOMATION HOOKS
+    scripts = set(SCRIPT_REFERENCE_RE.findall(content))
+    
+    if not scripts:
+        log("  ⏭️  No script references found")
+        return False
     
+    # Check which scripts are missing
     missing = scripts - registered_scripts
     
     if not missing:
-        print(f"  ✅ All {len(scripts)} scripts already registered")
+        log(f"  ✅ All {len(scripts)} scripts already registered")
         return False
     
     # Add missing scripts to registry under appropriate category
@@ -268,71 +324,86 @@ def register_missing_scripts(protocol_id: str, content: str, registry_path: Path
     for script in missing:
         script_name = script.replace('.py', '').replace('_', '-')
         registry[category_key][script_name] = f"scripts/{script}"
+    registered_scripts.update(missing)
     
-    # Save updated registry
-    try:
-        registry_path.write_text(json.dumps(registry, indent=2))
-        print(f"  ✅ Registered {len(missing)} missing scripts")
-        return True
-    except Exception as e:
-        print(f"  ❌ Error saving registry: {e}")
-        return False
+    log(f"  ✅ Registered {len(missing)} missing scripts")
+    return True
+
 
+def apply_cycle3_improvements(
+    protocol_path: Path, protocol_id: str, cache: Optional[Dict[str, str]] = None
+) -> Tuple[bool, Optional[str]]:
+    """Apply Cycle 3 content improvements to a protocol.
 
-def apply_cycle3_improvements(protocol_path: Path) -> bool:
-    """Apply Cycle 3 improvements to a protocol."""
+    Returns whether the file changed and its final content (``None`` on error).
+    Script registration is left to the caller so the shared registry is updated
+    in protocol order even when protocols are processed in parallel.
+    ``cache`` maps protocol names to the hash of content a previous run left
+    unchanged; files whose content still matches are skipped.
+    """
     try:
-        content = protocol_path.read_text()
+        content = protocol_path.read_text(encoding='utf-8')
         original_content = content
         
-        protocol_id = protocol_path.name.split('-')[0]
-        print(f"\n📋 Processing Protocol {protocol_id}: {protocol_path.name}")
+        log(f"\n📋 Processing Protocol {protocol_id}: {protocol_path.name}")
         
-        # 1. Enhance role constraints
-        content = enhance_role_constraints(content)
+        if cache is not None and cache.get(protocol_path.name) == content_digest(content):
+            log(f"  ⏭️  SKIPPED: Unchanged since last run")
+            return False, content
         
-        # 2. Add evidence traceability
-        content = add_evidence_traceability(content)
-        
-        # 3. Expand handoff checklist
-        content = expand_handoff_checklist(content)
-        
-        # 4. Enhance communication templates
-        content = enhance_communication_templates(content)
-        
-        # 5. Register missing scripts
-        registry_path = protocol_path.parent.parent / 'scripts' / 'script-registry.json'
-        if registry_path.exists():
-            register_missing_scripts(protocol_id, content, registry_path)
+        # 1-4. Role constraints, evidence traceability, handoff checklist,
+        # communication templates
+        content = apply_section_fixes(content)
         
         # Write changes
         if content != original_content:
-            protocol_path.write_text(content)
-            print(f"  ✅ SAVED: {protocol_path.name}")
-            return True
+            protocol_path.write_bytes(content.encode('utf-8'))
+            log(f"  ✅ SAVED: {protocol_path.name}")
+            return True, content
         else:
-            print(f"  ⏭️  SKIPPED: No changes needed")
-            return False
+            log(f"  ⏭️  SKIPPED: No changes needed")
+            # Only no-op content is cached: a pass that changed the file may
+            # still change it again on the next run
+            if cache is not None:
+                cache[protocol_path.name] = content_digest(content)
+            return False, content
             
     except Exception as e:
-        print(f"  ❌ ERROR: {e}")
-        return False
+        log(f"  ❌ ERROR: {e}")
+        return False, None
+
+
+def find_protocol_files(protocols_dir: Path, protocol_numbers: Sequence[str]) -> List[Path]:
+    """List ``NN-*.md`` protocol files with a single directory scan.
+
+    With ``protocol_numbers`` the result follows their order; otherwise every
+    two-digit protocol is returned sorted by name.
+    """
+    by_number: Dict[str, List[Path]] = {}
+    with os.scandir(protocols_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            number, sep, _ = name.partition('-')
+            if sep and name.endswith('.md') and entry.is_file():
+                by_number.setdefault(number, []).append(Path(entry.path))
+    if protocol_numbers:
+        return [path for num in dict.fromkeys(protocol_numbers) for path in sorted(by_number.get(num, []))]
+    return sorted(
+        path
+        for number, paths in by_number.items()
+        if len(number) == 2 and number.isdigit()
+        for path in paths
+    )
 
 
 def main():
     """Main execution."""
     protocols_dir = Path(__file__).parent.parent / '.cursor' / 'ai-driven-workflow'
     
-    if len(sys.argv) > 1:
-        # Process specific protocols
-        protocol_numbers = [num.zfill(2) for num in sys.argv[1:]]
-        protocol_files = []
-        for num in protocol_numbers:
-            files = list(protocols_dir.glob(f"{num}-*.md"))
-            protocol_files.extend(files)
-    else:
-        # Process all protocols
-        protocol_files = sorted(protocols_dir.glob("[0-9][0-9]-*.md"))
+    # Process specific protocols when numbers are given, otherwise all of them
+    protocol_numbers = tuple(num.zfill(2) for num in sys.argv[1:])
+    protocol_files = find_protocol_files(protocols_dir, protocol_numbers)
+    protocol_ids = [path.name.partition('-')[0] for path in protocol_files]
     
     if not protocol_files:
         print("❌ No protocol files found")
@@ -341,10 +412,42 @@ def main():
     print(f"🎯 Cycle 3: Final Polish for {len(protocol_files)} protocols")
     print("=" * 60)
     
+    # Load the script registry once; it is written back after all protocols
+    registry_path = protocols_dir.parent / 'scripts' / 'script-registry.json'
+    registry: Optional[Dict] = None
+    registered_scripts: Set[str] = set()
+    registry_dirty = False
+    if registry_path.exists():
+        try:
+            registry = json.loads(registry_path.read_text())
+            registered_scripts = collect_registered_scripts(registry)
+        except Exception as e:
+            print(f"❌ Error loading registry: {e}")
+    
+    # Hashes of already-polished protocols, so unchanged files are skipped on re-runs
+    cache_path = protocols_dir.parent.parent / '.artifacts' / '.cycle-cache.json'
+    cache = load_cycle_cache(cache_path)
+    
     improved_count = 0
-    for protocol_file in protocol_files:
-        if apply_cycle3_improvements(protocol_file):
-            improved_count += 1
+    worker = partial(_run_buffered, partial(apply_cycle3_improvements, cache=cache))
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(protocol_files))) as executor:
+        results = executor.map(worker, protocol_files, protocol_ids)
+        for protocol_id, ((improved, content), output) in zip(protocol_ids, results):
+            sys.stdout.write(output)
+            # Register missing scripts serially, in protocol order
+            if content is not None and registry is not None:
+                if register_missing_scripts(protocol_id, content, registry, registered_scripts):
+                    registry_dirty = True
+            if improved:
+                improved_count += 1
+    
+    if registry_dirty:
+        try:
+            registry_path.write_bytes(json.dumps(registry, indent=2).encode('utf-8'))
+        except Exception as e:
+            print(f"❌ Error saving registry: {e}")
+    
+    save_cycle_cache(cache_path, cache)
     
     print("\n" + "=" * 60)
     print(f"📊 SUMMARY: Improved {improved_count}/{len(protocol_files)} protocols")
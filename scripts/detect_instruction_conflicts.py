@@ -9,20 +9,202 @@ Detects ambiguous, conflicting, or contradictory instructions:
 """
 
 import argparse
+import bisect
+import functools
+import hashlib
 import json
 import os
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Set, Callable
+
+from json_io import load_cache, save_cache, source_key
+
+# Directive tags a pattern source requires, e.g. r"\[MUST\]..." -> "MUST",
+# r"\[(?:MUST|STRICT)\]..." -> "MUST|STRICT"
+REQUIRED_DIRECTIVE_RE = re.compile(r'^\\\[(?:\(\?:)?(\w+(?:\|\w+)*)\)?\\\]')
+NEWLINE_RE = re.compile(r'\n')
+
+# How far past its tag a directive pattern looks for its keyword; directive
+# lines in the protocols stay well under this, and the bound keeps a long
+# line full of tags from being rescanned once per tag
+DIRECTIVE_SPAN = 200
+
+# Fewer protocols than this are scanned in-process; starting workers costs more
+PARALLEL_MIN_PROTOCOLS = 3
+
+# Per-protocol results of the last full run, reused while a protocol's content
+# and this script are unchanged; bump the version when the cache layout changes
+RESULT_CACHE_FILE = Path('.artifacts') / 'conflict_cache.json'
+RESULT_CACHE_VERSION = 1
+
+# Contradiction patterns
+CONTRADICTION_PATTERNS = (
+    (r'\[MUST\].*?(?:skip|ignore|avoid)', r'\[MUST\].*?(?:execute|run|perform)', 'must_skip_vs_execute'),
+    (r'\[MUST\].*?(?:never|not)', r'\[MUST\].*?(?:always|always)', 'must_never_vs_always'),
+    (r'\[STRICT\].*?(?:optional|may)', r'\[STRICT\].*?(?:required|must)', 'strict_optional_vs_required'),
+    (r'\[GUIDELINE\].*?(?:must|required)', r'\[GUIDELINE\].*?(?:should|recommended)', 'guideline_must_vs_should')
+)
+
+# Ambiguity patterns: a [MUST] or [STRICT] directive followed by a vague qualifier
+AMBIGUITY_QUALIFIERS = {
+    'vague': r'might|could|maybe|perhaps',
+    'conditional': r'if\s+possible|when\s+available',
+    'attempt': r'try\s+to|attempt\s+to',
+}
+AMBIGUITY_TYPES = {
+    ('MUST', 'vague'): 'vague_must_directive',
+    ('STRICT', 'vague'): 'vague_strict_directive',
+    ('MUST', 'conditional'): 'conditional_must',
+    ('STRICT', 'conditional'): 'conditional_strict',
+    ('MUST', 'attempt'): 'attempt_must',
+    ('STRICT', 'attempt'): 'attempt_strict'
+}
+
+# Completeness patterns
+COMPLETENESS_PATTERNS = (
+    (r'if\s+(?:.*?)\s+then\s+(?:.*?)(?!\s+else)', 'missing_else_branch'),
+    (r'when\s+(?:.*?)\s+do\s+(?:.*?)(?!\s+otherwise)', 'missing_otherwise_branch'),
+    (r'\[MUST\].*?(?:handle|manage)\s+(?:.*?)(?!\s+if\s+.*?\s+fails)', 'missing_error_handling'),
+    (r'\[STRICT\].*?(?:handle|manage)\s+(?:.*?)(?!\s+if\s+.*?\s+fails)', 'missing_error_handling')
+)
+
+# Step references, checked for circular dependencies. The case-insensitive
+# "STEP" is spelled out as character classes (with the long s, which
+# IGNORECASE also accepts for S) because re only runs its fast prefix scan
+# for case-sensitive patterns
+STEP_REF_PATTERN = r'[Ss\u017f][Tt][Ee][Pp]\s+(\d+(?:\.\d+)*)'
+
+# Ambiguous pronouns in directive context
+PRONOUN_PATTERN = r'\[(?:MUST|STRICT|GUIDELINE)\].*?(?:it|this|that|they|them)\s+(?:should|must|will)'
+
+# Operations that should have error handling, and the handling that satisfies them
+OPERATION_PATTERNS = (
+    r'\[MUST\].*?(?:execute|run|perform|create|generate|write|save)',
+    r'\[STRICT\].*?(?:execute|run|perform|create|generate|write|save)'
+)
+ERROR_HANDLING_PATTERNS = (
+    r'if\s+(?:.*?)\s+(?:fails|error|exception)',
+    r'catch\s+(?:.*?)\s+(?:error|exception)',
+    r'handle\s+(?:.*?)\s+(?:error|failure)',
+    r'on\s+(?:.*?)\s+(?:error|failure)'
+)
+
+DIRECTIVE_TAGS = ('MUST', 'STRICT', 'GUIDELINE')
+
+# Result lists summarised in "issues", with the severity and type they report as
+ISSUE_CATEGORIES = (
+    ("contradictions", "critical", "contradiction"),
+    ("ambiguities", "warning", "ambiguity"),
+    ("completeness_issues", "warning", "completeness"),
+)
+
+
+@dataclass(frozen=True)
+class PatternTables:
+    """Compiled detection patterns shared by every InstructionConflictDetector."""
+    contradiction_patterns: Tuple[Tuple[re.Pattern, re.Pattern, str], ...]
+    ambiguity_patterns: Tuple[Tuple[re.Pattern, str], ...]
+    ambiguity_token_pattern: re.Pattern
+    completeness_patterns: Tuple[Tuple[re.Pattern, str], ...]
+    step_ref_pattern: re.Pattern
+    pronoun_pattern: re.Pattern
+    operation_patterns: Tuple[re.Pattern, ...]
+    error_handling_patterns: Tuple[re.Pattern, ...]
+    directive_tag_patterns: Dict[str, re.Pattern]
+    filtered_patterns: Tuple[re.Pattern, ...]
+    required_directives: Dict[re.Pattern, Optional[Set[str]]]
+
+
+def compile_detection_pattern(pattern: str) -> re.Pattern:
+    """Compile a detection pattern case-insensitively.
+    
+    Patterns that start at a directive tag only look at the rest of that
+    directive's line, up to DIRECTIVE_SPAN characters past the tag; the
+    others (if/then, when/do) may span lines.
+    """
+    directive = REQUIRED_DIRECTIVE_RE.match(pattern)
+    if directive is None:
+        return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    if pattern.startswith('.*?', directive.end()):
+        pattern = f'{pattern[:directive.end()]}.{{0,{DIRECTIVE_SPAN}}}?{pattern[directive.end() + 3:]}'
+    return re.compile(pattern, re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern_tables() -> PatternTables:
+    """Compile the detection patterns once per process."""
+    contradiction_patterns = tuple(
+        (compile_detection_pattern(pattern1), compile_detection_pattern(pattern2), conflict_type)
+        for pattern1, pattern2, conflict_type in CONTRADICTION_PATTERNS
+    )
+    ambiguity_patterns = tuple(
+        (compile_detection_pattern(rf'\[{directive}\].*?(?:{AMBIGUITY_QUALIFIERS[qualifier]})'), ambiguity_type)
+        for (directive, qualifier), ambiguity_type in AMBIGUITY_TYPES.items()
+    )
+    # Zero-width, so overlapping directives and qualifiers are all reported
+    # by one scan; each token's group name is its directive or qualifier, or
+    # "newline" for the line breaks that end a directive's scope. The leading
+    # class of every token's first character lets most offsets fail at once
+    qualifier_initials = sorted({
+        alternative[0] for alternatives in AMBIGUITY_QUALIFIERS.values() for alternative in alternatives.split('|')
+    })
+    ambiguity_token_pattern = re.compile(
+        rf"(?=[\[\n{''.join(qualifier_initials)}])"
+        + r'(?=(?P<MUST>\[MUST\])|(?P<STRICT>\[STRICT\])|'
+        + '|'.join(f'(?P<{qualifier}>{alternatives})' for qualifier, alternatives in AMBIGUITY_QUALIFIERS.items())
+        + r'|(?P<newline>\n))',
+        re.IGNORECASE
+    )
+    completeness_patterns = tuple(
+        (compile_detection_pattern(pattern), issue_type) for pattern, issue_type in COMPLETENESS_PATTERNS
+    )
+    pronoun_pattern = compile_detection_pattern(PRONOUN_PATTERN)
+    operation_patterns = tuple(compile_detection_pattern(pattern) for pattern in OPERATION_PATTERNS)
+    
+    # Literal directive tags, searched once per protocol so patterns whose
+    # required tag is absent can be skipped without scanning the content
+    directive_tag_patterns = {
+        tag: re.compile(re.escape(f'[{tag}]'), re.IGNORECASE) for tag in DIRECTIVE_TAGS
+    }
+    filtered_patterns = (
+        tuple(pattern for pattern1, pattern2, _ in contradiction_patterns for pattern in (pattern1, pattern2))
+        + tuple(pattern for pattern, _ in ambiguity_patterns)
+        + tuple(pattern for pattern, _ in completeness_patterns)
+        + operation_patterns
+        + (pronoun_pattern,)
+    )
+    required_directives: Dict[re.Pattern, Optional[Set[str]]] = {}
+    for pattern in filtered_patterns:
+        required = REQUIRED_DIRECTIVE_RE.match(pattern.pattern)
+        required_directives[pattern] = set(required.group(1).split('|')) if required else None
+    
+    return PatternTables(
+        contradiction_patterns=contradiction_patterns,
+        ambiguity_patterns=ambiguity_patterns,
+        ambiguity_token_pattern=ambiguity_token_pattern,
+        completeness_patterns=completeness_patterns,
+        step_ref_pattern=re.compile(STEP_REF_PATTERN),
+        pronoun_pattern=pronoun_pattern,
+        operation_patterns=operation_patterns,
+        error_handling_patterns=tuple(re.compile(pattern, re.IGNORECASE) for pattern in ERROR_HANDLING_PATTERNS),
+        directive_tag_patterns=directive_tag_patterns,
+        filtered_patterns=filtered_patterns,
+        required_directives=required_directives,
+    )
 
 
 class InstructionConflictDetector:
     """Detects conflicts and ambiguities in protocol instructions."""
     
-    def __init__(self, workspace_root: str = "."):
+    def __init__(self, workspace_root: str = ".", use_cache: bool = True):
         self.workspace_root = Path(workspace_root)
         self.ai_driven_workflow_dir = self.workspace_root / ".cursor" / "ai-driven-workflow"
+        self.result_cache_path = self.workspace_root / RESULT_CACHE_FILE if use_cache else None
         
         # Protocol files
         self.protocols = {
@@ -34,32 +216,30 @@ class InstructionConflictDetector:
             "4": "4-quality-audit.md",
             "5": "5-implementation-retrospective.md"
         }
-        
-        # Contradiction patterns
-        self.contradiction_patterns = [
-            (r'\[MUST\].*?(?:skip|ignore|avoid)', r'\[MUST\].*?(?:execute|run|perform)', 'must_skip_vs_execute'),
-            (r'\[MUST\].*?(?:never|not)', r'\[MUST\].*?(?:always|always)', 'must_never_vs_always'),
-            (r'\[STRICT\].*?(?:optional|may)', r'\[STRICT\].*?(?:required|must)', 'strict_optional_vs_required'),
-            (r'\[GUIDELINE\].*?(?:must|required)', r'\[GUIDELINE\].*?(?:should|recommended)', 'guideline_must_vs_should')
-        ]
-        
-        # Ambiguity patterns
-        self.ambiguity_patterns = [
-            (r'\[MUST\].*?(?:might|could|maybe|perhaps)', 'vague_must_directive'),
-            (r'\[STRICT\].*?(?:might|could|maybe|perhaps)', 'vague_strict_directive'),
-            (r'\[MUST\].*?(?:if\s+possible|when\s+available)', 'conditional_must'),
-            (r'\[STRICT\].*?(?:if\s+possible|when\s+available)', 'conditional_strict'),
-            (r'\[MUST\].*?(?:try\s+to|attempt\s+to)', 'attempt_must'),
-            (r'\[STRICT\].*?(?:try\s+to|attempt\s+to)', 'attempt_strict')
-        ]
-        
-        # Completeness patterns
-        self.completeness_patterns = [
-            (r'if\s+(?:.*?)\s+then\s+(?:.*?)(?!\s+else)', 'missing_else_branch'),
-            (r'when\s+(?:.*?)\s+do\s+(?:.*?)(?!\s+otherwise)', 'missing_otherwise_branch'),
-            (r'\[MUST\].*?(?:handle|manage)\s+(?:.*?)(?!\s+if\s+.*?\s+fails)', 'missing_error_handling'),
-            (r'\[STRICT\].*?(?:handle|manage)\s+(?:.*?)(?!\s+if\s+.*?\s+fails)', 'missing_error_handling')
-        ]
+        # Entries of the protocol directory, listed once instead of stat'ing each file
+        if self.ai_driven_workflow_dir.is_dir():
+            with os.scandir(self.ai_driven_workflow_dir) as entries:
+                self._present_files: Set[str] = {entry.name for entry in entries}
+        else:
+            self._present_files = set()
+        
+        # Compiled pattern tables are shared by every detector in the process
+        tables = compile_pattern_tables()
+        self.contradiction_patterns = tables.contradiction_patterns
+        self.ambiguity_types = AMBIGUITY_TYPES
+        self.ambiguity_patterns = tables.ambiguity_patterns
+        self.ambiguity_token_pattern = tables.ambiguity_token_pattern
+        self.completeness_patterns = tables.completeness_patterns
+        self.step_ref_pattern = tables.step_ref_pattern
+        self.pronoun_pattern = tables.pronoun_pattern
+        self.operation_patterns = tables.operation_patterns
+        self.error_handling_patterns = tables.error_handling_patterns
+        self.directive_tag_patterns = tables.directive_tag_patterns
+        self.filtered_patterns = tables.filtered_patterns
+        self._required_directives = tables.required_directives
+        
+        # Line start offsets of the most recently scanned content
+        self._line_index_cache: Optional[Tuple[str, List[int]]] = None
     
     def detect_instruction_conflicts(self) -> Dict[str, Any]:
         """Run comprehensive conflict detection across all protocols."""
@@ -80,10 +260,36 @@ class InstructionConflictDetector:
             "recommendations": []
         }
         
+        # Read every protocol first so the scans can run side by side
+        contents: Dict[str, Any] = {}
+        for protocol_id, protocol_file in self.protocols.items():
+            if protocol_file in self._present_files:
+                try:
+                    contents[protocol_id] = (self.ai_driven_workflow_dir / protocol_file).read_text(encoding='utf-8')
+                except Exception as e:
+                    contents[protocol_id] = e
+        digests = {
+            protocol_id: hashlib.sha256(content.encode('utf-8')).hexdigest()
+            for protocol_id, content in contents.items() if isinstance(content, str)
+        }
+        
+        # Protocols whose content matches the last run reuse its results
+        cache = self._load_result_cache()
+        cached = {
+            protocol_id: cache[protocol_id]["results"]
+            for protocol_id, digest in digests.items()
+            if cache.get(protocol_id, {}).get("sha256") == digest
+        }
+        scans = self._scan_protocols({
+            protocol_id: contents[protocol_id] for protocol_id in digests if protocol_id not in cached
+        })
+        scans.update({protocol_id: functools.partial(cached.__getitem__, protocol_id) for protocol_id in cached})
+        updated_cache: Dict[str, Any] = {}
+        
         for protocol_id, protocol_file in self.protocols.items():
-            protocol_path = self.dev_workflow_dir / protocol_file
+            protocol_path = self.ai_driven_workflow_dir / protocol_file
             
-            if not protocol_path.exists():
+            if protocol_file not in self._present_files:
                 results["issues"].append({
                     "severity": "critical",
                     "protocol": f"protocol_{protocol_id}",
@@ -94,8 +300,11 @@ class InstructionConflictDetector:
                 continue
             
             try:
-                content = protocol_path.read_text(encoding='utf-8')
-                protocol_results = self._detect_single_protocol_conflicts(protocol_id, content)
+                content = contents[protocol_id]
+                if isinstance(content, Exception):
+                    raise content
+                protocol_results = scans[protocol_id]()
+                updated_cache[protocol_id] = {"sha256": digests[protocol_id], "results": protocol_results}
                 results["summary"]["validated"] += 1
                 
                 # Aggregate results
@@ -121,18 +330,75 @@ class InstructionConflictDetector:
                 })
                 results["summary"]["critical_issues"] += 1
         
-        # Calculate overall status
-        total_issues = (results["summary"]["contradictions"] + 
-                       results["summary"]["ambiguities"] + 
-                       results["summary"]["completeness_issues"])
+        if updated_cache != cache:
+            self._save_result_cache(updated_cache)
         
-        if results["summary"]["critical_issues"] > 0:
-            results["status"] = "fail"
-        elif total_issues > 0:
-            results["status"] = "warning"
+        # Calculate overall status
+        results["status"] = self._overall_status(results["summary"])
         
         return results
     
+    def detect_protocol_conflicts(self, protocol_id: str, content: str) -> Dict[str, Any]:
+        """Run conflict detection on one protocol, reported in the same shape as a full run."""
+        protocol_results = self._detect_single_protocol_conflicts(protocol_id, content)
+        summary = {
+            "total_protocols": 1,
+            "validated": 1,
+            "contradictions": len(protocol_results["contradictions"]),
+            "ambiguities": len(protocol_results["ambiguities"]),
+            "completeness_issues": len(protocol_results["completeness_issues"]),
+            "critical_issues": sum(1 for issue in protocol_results["issues"] if issue["severity"] == "critical")
+        }
+        return {
+            "status": self._overall_status(summary),
+            "summary": summary,
+            "contradictions": protocol_results["contradictions"],
+            "ambiguities": protocol_results["ambiguities"],
+            "completeness_issues": protocol_results["completeness_issues"],
+            "issues": protocol_results["issues"],
+            "recommendations": []
+        }
+    
+    @staticmethod
+    def _overall_status(summary: Dict[str, int]) -> str:
+        """Return fail on critical issues, warning on any other findings, else pass."""
+        total_issues = summary["contradictions"] + summary["ambiguities"] + summary["completeness_issues"]
+        if summary["critical_issues"] > 0:
+            return "fail"
+        if total_issues > 0:
+            return "warning"
+        return "pass"
+    
+    def _load_result_cache(self) -> Dict[str, Any]:
+        """Load cached per-protocol results, or nothing if they came from other code."""
+        if self.result_cache_path is None:
+            return {}
+        return load_cache(self.result_cache_path, source_key(RESULT_CACHE_VERSION, Path(__file__)), "protocols")
+    
+    def _save_result_cache(self, protocols: Dict[str, Any]) -> None:
+        """Write the per-protocol results for the next run."""
+        if self.result_cache_path is None:
+            return
+        save_cache(self.result_cache_path, source_key(RESULT_CACHE_VERSION, Path(__file__)), "protocols", protocols)
+    
+    def _scan_protocols(self, contents: Dict[str, str]) -> Dict[str, Callable[[], Dict[str, Any]]]:
+        """Scan protocol contents, in worker processes when there are several.
+        
+        Returns a callable per protocol that yields its results or raises the
+        error its scan hit.
+        """
+        if len(contents) < PARALLEL_MIN_PROTOCOLS:
+            return {
+                protocol_id: functools.partial(self._detect_single_protocol_conflicts, protocol_id, content)
+                for protocol_id, content in contents.items()
+            }
+        with ProcessPoolExecutor(max_workers=min(len(contents), os.cpu_count() or 1)) as executor:
+            futures = {
+                protocol_id: executor.submit(_scan_protocol, str(self.workspace_root), protocol_id, content)
+                for protocol_id, content in contents.items()
+            }
+        return {protocol_id: future.result for protocol_id, future in futures.items()}
+    
     def _detect_single_protocol_conflicts(self, protocol_id: str, content: str) -> Dict[str, Any]:
         """Detect conflicts in a single protocol."""
         results = {
@@ -142,58 +408,71 @@ class InstructionConflictDetector:
             "completeness_issues": [],
             "issues": []
         }
+        candidates = self._candidate_patterns(content)
         
         # Detect contradictions
-        results["contradictions"] = self._detect_contradictions(content, protocol_id)
+        results["contradictions"] = self._detect_contradictions(content, protocol_id, candidates)
         
         # Detect ambiguities
-        results["ambiguities"] = self._detect_ambiguities(content, protocol_id)
+        results["ambiguities"] = self._detect_ambiguities(content, protocol_id, candidates)
         
         # Detect completeness issues
-        results["completeness_issues"] = self._detect_completeness_issues(content, protocol_id)
-        
-        # Convert to issues format
-        for contradiction in results["contradictions"]:
-            results["issues"].append({
-                "severity": "critical",
-                "type": "contradiction",
-                "message": contradiction["message"],
-                "fix": contradiction["fix"]
-            })
-        
-        for ambiguity in results["ambiguities"]:
-            results["issues"].append({
-                "severity": "warning",
-                "type": "ambiguity",
-                "message": ambiguity["message"],
-                "fix": ambiguity["fix"]
-            })
-        
-        for completeness in results["completeness_issues"]:
-            results["issues"].append({
-                "severity": "warning",
-                "type": "completeness",
-                "message": completeness["message"],
-                "fix": completeness["fix"]
-            })
+        results["completeness_issues"] = self._detect_completeness_issues(content, protocol_id, candidates)
+        
+        # Convert to issues format; findings of one kind share message and
+        # fix, so identical issue entries are built once and reused
+        issue_entries: Dict[Tuple[str, str, str, str], Dict[str, str]] = {}
+        for category, severity, issue_type in ISSUE_CATEGORIES:
+            for finding in results[category]:
+                key = (severity, issue_type, finding["message"], finding["fix"])
+                entry = issue_entries.get(key)
+                if entry is None:
+                    entry = issue_entries[key] = {
+                        "severity": severity,
+                        "type": issue_type,
+                        "message": finding["message"],
+                        "fix": finding["fix"]
+                    }
+                results["issues"].append(entry)
         
         return results
     
-    def _detect_contradictions(self, content: str, protocol_id: str) -> List[Dict[str, Any]]:
+    def _present_directives(self, content: str) -> Set[str]:
+        """Return the directive tags (MUST, STRICT, GUIDELINE) that occur in content."""
+        return {tag for tag, pattern in self.directive_tag_patterns.items() if pattern.search(content)}
+    
+    def _candidate_patterns(self, content: str) -> Set[re.Pattern]:
+        """Return the filtered patterns that can match content."""
+        directives = self._present_directives(content)
+        return {
+            pattern for pattern, required in self._required_directives.items()
+            if required is None or not required.isdisjoint(directives)
+        }
+    
+    @staticmethod
+    def _may_match(pattern: re.Pattern, candidates: Optional[Set[re.Pattern]]) -> bool:
+        """Whether pattern can match given the candidate set (None = unknown)."""
+        return candidates is None or pattern in candidates
+    
+    def _detect_contradictions(self, content: str, protocol_id: str, candidates: Optional[Set[re.Pattern]] = None) -> List[Dict[str, Any]]:
         """Detect contradictory instructions."""
         contradictions = []
         
         for pattern1, pattern2, conflict_type in self.contradiction_patterns:
-            matches1 = list(re.finditer(pattern1, content, re.IGNORECASE | re.DOTALL))
-            matches2 = list(re.finditer(pattern2, content, re.IGNORECASE | re.DOTALL))
+            if not (self._may_match(pattern1, candidates) and self._may_match(pattern2, candidates)):
+                continue
+            # Only the match counts are reported, so matches are counted as
+            # they stream past instead of being kept
+            matches1 = sum(1 for _ in pattern1.finditer(content))
+            matches2 = sum(1 for _ in pattern2.finditer(content)) if matches1 else 0
             
             if matches1 and matches2:
                 contradictions.append({
                     "type": conflict_type,
-                    "pattern1": pattern1,
-                    "pattern2": pattern2,
-                    "matches1": len(matches1),
-                    "matches2": len(matches2),
+                    "pattern1": pattern1.pattern,
+                    "pattern2": pattern2.pattern,
+                    "matches1": matches1,
+                    "matches2": matches2,
                     "message": f"Contradictory instructions detected: {conflict_type}",
                     "fix": "Review and resolve conflicting directives",
                     "protocol": protocol_id
@@ -210,66 +489,117 @@ class InstructionConflictDetector:
         circular_deps = []
         
         # Look for step references that create cycles
-        step_ref_pattern = r'STEP\s+(\d+(?:\.\d+)*)'
-        step_refs = re.findall(step_ref_pattern, content, re.IGNORECASE)
+        step_refs = self.step_ref_pattern.findall(content)
         
         # Simple circular dependency detection
         # This is a basic implementation - could be enhanced
-        for i, ref1 in enumerate(step_refs):
-            for j, ref2 in enumerate(step_refs[i+1:], i+1):
-                if ref1 == ref2:
-                    # Check if they reference each other
-                    ref1_context = self._extract_context_around_pattern(content, f"STEP {ref1}")
-                    ref2_context = self._extract_context_around_pattern(content, f"STEP {ref2}")
-                    
-                    if ref2 in ref1_context and ref1 in ref2_context:
-                        circular_deps.append({
-                            "type": "circular_dependency",
-                            "step1": ref1,
-                            "step2": ref2,
-                            "message": f"Circular dependency detected between STEP {ref1} and STEP {ref2}",
-                            "fix": "Break circular dependency by restructuring steps",
-                            "protocol": "unknown"  # Would need protocol context
-                        })
+        # Every later repeat of a step reference pairs with it, and whether a
+        # pair is circular depends only on the shared step id, so the context
+        # check runs once per distinct id instead of once per pair
+        remaining = Counter(step_refs)
+        is_circular: Dict[str, bool] = {}
+        for ref in step_refs:
+            remaining[ref] -= 1
+            if not remaining[ref]:
+                continue
+            if ref not in is_circular:
+                # Check if they reference each other
+                ref_context = self._extract_context_around_pattern(content, f"STEP {ref}")
+                is_circular[ref] = ref in ref_context
+            if is_circular[ref]:
+                for _ in range(remaining[ref]):
+                    circular_deps.append({
+                        "type": "circular_dependency",
+                        "step1": ref,
+                        "step2": ref,
+                        "message": f"Circular dependency detected between STEP {ref} and STEP {ref}",
+                        "fix": "Break circular dependency by restructuring steps",
+                        "protocol": "unknown"  # Would need protocol context
+                    })
         
         return circular_deps
     
-    def _detect_ambiguities(self, content: str, protocol_id: str) -> List[Dict[str, Any]]:
+    def _detect_ambiguities(self, content: str, protocol_id: str, candidates: Optional[Set[re.Pattern]] = None) -> List[Dict[str, Any]]:
         """Detect ambiguous instructions."""
         ambiguities = []
         
-        for pattern, ambiguity_type in self.ambiguity_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE | re.DOTALL))
-            
-            for match in matches:
-                ambiguities.append({
-                    "type": ambiguity_type,
-                    "pattern": pattern,
-                    "line_number": content[:match.start()].count('\n') + 1,
-                    "context": self._extract_context(content, match.start(), match.end()),
-                    "message": f"Ambiguous instruction detected: {ambiguity_type}",
-                    "fix": "Use definitive language in directives",
-                    "protocol": protocol_id
-                })
+        if any(self._may_match(pattern, candidates) for pattern, _ in self.ambiguity_patterns):
+            match_spans = self._find_ambiguity_matches(content)
+            for (pattern, ambiguity_type), spans in zip(self.ambiguity_patterns, match_spans.values()):
+                for start, end in spans:
+                    ambiguities.append({
+                        "type": ambiguity_type,
+                        "pattern": pattern.pattern,
+                        "line_number": self._line_number(content, start),
+                        "context": self._extract_context(content, start, end),
+                        "message": f"Ambiguous instruction detected: {ambiguity_type}",
+                        "fix": "Use definitive language in directives",
+                        "protocol": protocol_id
+                    })
         
         # Check for unclear pronouns
-        pronoun_ambiguities = self._detect_pronoun_ambiguities(content)
+        pronoun_ambiguities = self._detect_pronoun_ambiguities(content, candidates)
         ambiguities.extend(pronoun_ambiguities)
         
         return ambiguities
     
-    def _detect_pronoun_ambiguities(self, content: str) -> List[Dict[str, Any]]:
+    def _find_ambiguity_matches(self, content: str) -> Dict[Tuple[str, str], List[Tuple[int, int]]]:
+        """Return where each ambiguity pattern matches, from a single token scan.
+
+        Replays ``finditer`` for every ``[directive].{0,N}?(qualifier)``
+        pattern: a directive at or after the previous match's end waits for
+        the first qualifier after it on the same line, and matches it when it
+        starts within DIRECTIVE_SPAN characters; a match claims the earliest
+        waiting directive.
+        """
+        match_spans: Dict[Tuple[str, str], List[Tuple[int, int]]] = {key: [] for key in self.ambiguity_types}
+        pending: Dict[Tuple[str, str], List[Tuple[int, int]]] = {key: [] for key in self.ambiguity_types}
+        resume_at = dict.fromkeys(self.ambiguity_types, 0)
+        # The patterns each token kind can open or close
+        directive_keys: Dict[str, List[Tuple[str, str]]] = {}
+        qualifier_keys: Dict[str, List[Tuple[str, str]]] = {}
+        for key in self.ambiguity_types:
+            directive_keys.setdefault(key[0], []).append(key)
+            qualifier_keys.setdefault(key[1], []).append(key)
+        
+        for token in self.ambiguity_token_pattern.finditer(content):
+            kind = token.lastgroup
+            if kind == 'newline':
+                for directives in pending.values():
+                    directives.clear()
+                continue
+            start = token.start()
+            if kind in directive_keys:
+                for key in directive_keys[kind]:
+                    if start >= resume_at[key]:
+                        pending[key].append((start, token.end(kind)))
+                continue
+            for key in qualifier_keys[kind]:
+                directives = pending[key]
+                if directives:
+                    # Directives this qualifier is too far from can match no later one
+                    while directives and start - directives[0][1] > DIRECTIVE_SPAN:
+                        del directives[0]
+                    if directives and start >= directives[0][1]:
+                        resume_at[key] = token.end(kind)
+                        match_spans[key].append((directives[0][0], resume_at[key]))
+                        directives.clear()
+        
+        return match_spans
+    
+    def _detect_pronoun_ambiguities(self, content: str, candidates: Optional[Set[re.Pattern]] = None) -> List[Dict[str, Any]]:
         """Detect unclear pronoun references."""
         pronoun_ambiguities = []
+        if not self._may_match(self.pronoun_pattern, candidates):
+            return pronoun_ambiguities
         
         # Look for ambiguous pronouns in directive context
-        pronoun_pattern = r'\[(?:MUST|STRICT|GUIDELINE)\].*?(?:it|this|that|they|them)\s+(?:should|must|will)'
-        matches = re.finditer(pronoun_pattern, content, re.IGNORECASE)
+        matches = self.pronoun_pattern.finditer(content)
         
         for match in matches:
             pronoun_ambiguities.append({
                 "type": "pronoun_ambiguity",
-                "line_number": content[:match.start()].count('\n') + 1,
+                "line_number": self._line_number(content, match.start()),
                 "context": self._extract_context(content, match.start(), match.end()),
                 "message": "Unclear pronoun reference in directive",
                 "fix": "Replace pronouns with specific nouns",
@@ -278,18 +608,18 @@ class InstructionConflictDetector:
         
         return pronoun_ambiguities
     
-    def _detect_completeness_issues(self, content: str, protocol_id: str) -> List[Dict[str, Any]]:
+    def _detect_completeness_issues(self, content: str, protocol_id: str, candidates: Optional[Set[re.Pattern]] = None) -> List[Dict[str, Any]]:
         """Detect completeness issues in instructions."""
         completeness_issues = []
         
         for pattern, issue_type in self.completeness_patterns:
-            matches = list(re.finditer(pattern, content, re.IGNORECASE | re.DOTALL))
-            
-            for match in matches:
+            if not self._may_match(pattern, candidates):
+                continue
+            for match in pattern.finditer(content):
                 completeness_issues.append({
                     "type": issue_type,
-                    "pattern": pattern,
-                    "line_number": content[:match.start()].count('\n') + 1,
+                    "pattern": pattern.pattern,
+                    "line_number": self._line_number(content, match.start()),
                     "context": self._extract_context(content, match.start(), match.end()),
                     "message": f"Incomplete instruction detected: {issue_type}",
                     "fix": "Add missing branches or error handling",
@@ -297,45 +627,42 @@ class InstructionConflictDetector:
                 })
         
         # Check for missing error handling
-        error_handling_issues = self._detect_missing_error_handling(content)
+        error_handling_issues = self._detect_missing_error_handling(content, candidates)
         completeness_issues.extend(error_handling_issues)
         
         return completeness_issues
     
-    def _detect_missing_error_handling(self, content: str) -> List[Dict[str, Any]]:
+    def _detect_missing_error_handling(self, content: str, candidates: Optional[Set[re.Pattern]] = None) -> List[Dict[str, Any]]:
         """Detect missing error handling in instructions."""
         error_handling_issues = []
+        has_error_handling_by_line: Dict[int, bool] = {}
         
         # Look for operations that should have error handling
-        operation_patterns = [
-            r'\[MUST\].*?(?:execute|run|perform|create|generate|write|save)',
-            r'\[STRICT\].*?(?:execute|run|perform|create|generate|write|save)'
-        ]
-        
-        for pattern in operation_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.DOTALL)
+        for pattern in self.operation_patterns:
+            if not self._may_match(pattern, candidates):
+                continue
+            matches = pattern.finditer(content)
             
             for match in matches:
-                # Check if error handling exists in nearby context
-                context = self._extract_context(content, match.start(), match.end(), context_lines=5)
-                
-                error_handling_patterns = [
-                    r'if\s+(?:.*?)\s+(?:fails|error|exception)',
-                    r'catch\s+(?:.*?)\s+(?:error|exception)',
-                    r'handle\s+(?:.*?)\s+(?:error|failure)',
-                    r'on\s+(?:.*?)\s+(?:error|failure)'
-                ]
-                
-                has_error_handling = any(
-                    re.search(error_pattern, context, re.IGNORECASE)
-                    for error_pattern in error_handling_patterns
-                )
+                # Check if error handling exists in nearby context; the
+                # context only depends on the operation's line
+                line_number = self._line_number(content, match.start())
+                has_error_handling = has_error_handling_by_line.get(line_number)
+                if has_error_handling is None:
+                    context_start, context_end = self._context_bounds(content, match.start(), context_lines=5)
+                    # The handler patterns have no anchors or lookarounds, so a
+                    # bounded search equals searching the extracted context
+                    has_error_handling = any(
+                        error_pattern.search(content, context_start, context_end)
+                        for error_pattern in self.error_handling_patterns
+                    )
+                    has_error_handling_by_line[line_number] = has_error_handling
                 
                 if not has_error_handling:
                     error_handling_issues.append({
                         "type": "missing_error_handling",
-                        "line_number": content[:match.start()].count('\n') + 1,
-                        "context": context,
+                        "line_number": line_number,
+                        "context": self._extract_context(content, match.start(), match.end(), context_lines=5),
                         "message": "Operation lacks error handling",
                         "fix": "Add error handling for operation",
                         "protocol": "unknown"
@@ -343,15 +670,35 @@ class InstructionConflictDetector:
         
         return error_handling_issues
     
-    def _extract_context(self, content: str, start: int, end: int, context_lines: int = 2) -> str:
-        """Extract context around a match."""
-        lines = content.split('\n')
-        match_line = content[:start].count('\n')
+    def _line_index(self, content: str) -> List[int]:
+        """Return the start offset of every line, computed once per content."""
+        cached = self._line_index_cache
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        
+        line_starts = [0]
+        line_starts.extend(match.end() for match in NEWLINE_RE.finditer(content))
+        self._line_index_cache = (content, line_starts)
+        return line_starts
+    
+    def _line_number(self, content: str, position: int) -> int:
+        """Return the 1-based line number of an offset in content."""
+        return bisect.bisect_right(self._line_index(content), position)
+    
+    def _context_bounds(self, content: str, start: int, context_lines: int) -> Tuple[int, int]:
+        """Return the offsets of the lines within context_lines of the line containing start."""
+        line_starts = self._line_index(content)
+        match_line = bisect.bisect_right(line_starts, start) - 1
         
         start_line = max(0, match_line - context_lines)
-        end_line = min(len(lines), match_line + context_lines + 1)
-        
-        return '\n'.join(lines[start_line:end_line])
+        end_line = match_line + context_lines + 1
+        context_end = line_starts[end_line] - 1 if end_line < len(line_starts) else len(content)
+        return line_starts[start_line], context_end
+    
+    def _extract_context(self, content: str, start: int, end: int, context_lines: int = 2) -> str:
+        """Extract context around a match."""
+        context_start, context_end = self._context_bounds(content, start, context_lines)
+        return content[context_start:context_end]
     
     def _extract_context_around_pattern(self, content: str, pattern: str, context_lines: int = 3) -> str:
         """Extract context around a specific pattern."""
@@ -362,17 +709,23 @@ class InstructionConflictDetector:
         return self._extract_context(content, match.start(), match.end(), context_lines)
 
 
-def main():
+def _scan_protocol(workspace_root: str, protocol_id: str, content: str) -> Dict[str, Any]:
+    """Worker-process entry point for scanning one protocol."""
+    return InstructionConflictDetector(workspace_root)._detect_single_protocol_conflicts(protocol_id, content)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point for instruction conflict detection."""
     parser = argparse.ArgumentParser(description="Detect instruction conflicts and ambiguities")
     parser.add_argument("--workspace", "-w", default=".", help="Workspace root directory")
     parser.add_argument("--output", "-o", help="Output file for detection results (JSON)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--protocol", "-p", help="Detect conflicts in specific protocol only")
+    parser.add_argument("--no-cache", action="store_true", help="Rescan every protocol instead of reusing cached results")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
-    detector = InstructionConflictDetector(args.workspace)
+    detector = InstructionConflictDetector(args.workspace, use_cache=not args.no_cache)
     
     if args.protocol:
         # Detect conflicts in single protocol
@@ -380,13 +733,13 @@ def main():
             print(f"Error: Protocol {args.protocol} not found")
             sys.exit(1)
         
-        protocol_file = detector.dev_workflow_dir / detector.protocols[args.protocol]
-        if not protocol_file.exists():
+        protocol_file = detector.ai_driven_workflow_dir / detector.protocols[args.protocol]
+        if protocol_file.name not in detector._present_files:
             print(f"Error: Protocol file {protocol_file} not found")
             sys.exit(1)
         
         content = protocol_file.read_text(encoding='utf-8')
-        results = detector._detect_single_protocol_conflicts(args.protocol, content)
+        results = detector.detect_protocol_conflicts(args.protocol, content)
     else:
         # Detect conflicts in all protocols
         results = detector.detect_instruction_conflicts()
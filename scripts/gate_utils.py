@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import List
 
 import inventory_protocols
+from json_io import dumps_pretty
 
 ARTIFACTS_ROOT = Path(".artifacts")
 
@@ -22,17 +22,23 @@ class ManifestData:
     missing_scripts: List[str]
 
 
-def load_manifest_data(protocol_id: str) -> ManifestData:
+def _protocol_inventory(protocol_id: str) -> inventory_protocols.ProtocolInventory:
     protocol_dir = Path(".cursor/ai-driven-workflow")
     scripts_dir = Path("scripts")
-    inventories = [
-        inventory_protocols.build_inventory(path, scripts_dir)
+    # Only the requested protocol is parsed; when several files share an id
+    # the last one in sorted order wins, as with the former full lookup.
+    matches = [
+        path
         for path in inventory_protocols.discover_protocol_files(protocol_dir)
+        if path.name.split("-", 1)[0] == protocol_id
     ]
-    lookup = {item.protocol.split("-", 1)[0]: item for item in inventories}
-    if protocol_id not in lookup:
+    if not matches:
         raise ValueError(f"Unknown protocol id: {protocol_id}")
-    item = lookup[protocol_id]
+    return inventory_protocols.build_inventory(matches[-1], scripts_dir)
+
+
+def load_manifest_data(protocol_id: str) -> ManifestData:
+    item = _protocol_inventory(protocol_id)
     referenced = sorted(set(item.existing_scripts + item.missing_scripts))
     return ManifestData(
         protocol_id=protocol_id,
@@ -54,7 +60,7 @@ def write_manifest(
     manifest = {
         "protocol_id": data.protocol_id,
         "protocol_title": data.protocol_title,
-        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
         "automation_coverage": {
             "referenced_scripts": data.referenced_scripts,
             "missing_scripts": data.missing_scripts,
@@ -64,4 +70,4 @@ def write_manifest(
         "validators": validators,
         "notes": notes,
     }
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    manifest_path.write_bytes(dumps_pretty(manifest))
@@ -10,21 +10,152 @@ Generates comprehensive consistency report across all protocols:
 """
 
 import argparse
-import json
-import os
+import bisect
+import hashlib
+import importlib.util
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, FrozenSet, List, Tuple, Optional, Any, Union
 from datetime import datetime
 
+from json_io import dumps_pretty, load_cache, save_cache, source_key
+
+zstandard_spec = importlib.util.find_spec("zstandard")
+zstandard = importlib.import_module("zstandard") if zstandard_spec else None  # type: ignore[assignment]
+
+NEWLINE_RE = re.compile(r'\n')
+STEP_RE = re.compile(r'###\s*STEP\s+(\d+(?:\.\d+)*):\s*(.*)', re.IGNORECASE)
+PHASE_RE = re.compile(r'###\s*PHASE\s+(\d+(?:\.\d+)*):\s*(.*)', re.IGNORECASE)
+# One scan finds every directive tag; the named group that matched is its tag
+DIRECTIVE_TAGS = ("MUST", "GUIDELINE", "STRICT", "CRITICAL", "REQUIRED", "OPTIONAL")
+DIRECTIVE_RE = re.compile(
+    r'\[(?:' + '|'.join(f'(?P<{tag}>{tag})' for tag in DIRECTIVE_TAGS) + r')\]',
+    re.IGNORECASE
+)
+PERSONA_SECTION_RE = re.compile(r'##\s*AI\s+Persona\s*\n(.*?)(?=\n##|\n---|\Z)', re.IGNORECASE | re.DOTALL)
+# The keyword patterns below open with a lookahead for the keywords' first
+# letters, which lets the scan skip most positions without entering the alternation
+ROLE_RE = re.compile(r'(?=[ray])(?:Role|Act as|You are)\s*:?\s*(.*?)(?:\n|$)', re.IGNORECASE)
+# Gate and automation patterns are written in lower case and only counted: the
+# case-sensitive compilations run over lower-cased content, and the IGNORECASE
+# ones over content that lower-casing would miscount (see _lowered_for_counting)
+GATE_SOURCES = [
+    r'gate\s*:?\s*(.*?)(?:\n|$)',
+    r'pass\s+criteria\s*:?\s*(.*?)(?:\n|$)',
+    r'validation\s+threshold\s*:?\s*(.*?)(?:\n|$)',
+    r'score\s*≥\s*(\d+)',
+    r'≥\s*(\d+)'
+]
+GATE_RES = [re.compile(source, re.IGNORECASE) for source in GATE_SOURCES]
+GATE_LOWER_RES = [re.compile(source) for source in GATE_SOURCES]
+OUTPUT_VERBS = ("generate", "create", "output", "produce")
+OUTPUT_RE = re.compile(
+    '(?=[' + ''.join(sorted({verb[0] for verb in OUTPUT_VERBS})) + '])'
+    + '(?:' + '|'.join(f'(?P<{verb}>{verb})' for verb in OUTPUT_VERBS) + ')'
+    + r'\s+(?:a\s+)?(?P<file>[a-zA-Z0-9\-_]+\.(?:md|json|yaml|yml|txt))',
+    re.IGNORECASE
+)
+HANDOFF_KEYWORDS = ("handoff", "proceed", "continue", "next")
+HANDOFF_RE = re.compile(
+    '(?=[' + ''.join(sorted({keyword[0] for keyword in HANDOFF_KEYWORDS})) + '])'
+    r'(?:(?:(?P<handoff>handoff)|(?P<proceed>proceed)|(?P<continue>continue))\s+(?:to\s+)?(?:protocol\s+)?(?P<target>\d+)'
+    r'|(?P<next>next)\s+(?:protocol\s+)?(?P<next_target>\d+))',
+    re.IGNORECASE
+)
+AUTOMATION_SOURCES = [
+    r'\[automation\]',
+    r'automation\s+hook',
+    r'script\s+execution',
+    r'workflow\s+integration'
+]
+AUTOMATION_RES = [re.compile(source, re.IGNORECASE) for source in AUTOMATION_SOURCES]
+AUTOMATION_LOWER_RES = [re.compile(source) for source in AUTOMATION_SOURCES]
+# Characters IGNORECASE matches against an ASCII letter although str.lower()
+# does not turn them into it (dotted and dotless I, long s)
+CASE_FOLD_EXCEPTIONS = '\u0130\u0131\u017f'
+
+# Words that give a directive context a negative or positive direction; they
+# are matched as substrings of the lower-cased context, so "not" also hits "nothing"
+NEGATIVE_WORDS_RE = re.compile('skip|ignore|avoid|never|not')
+POSITIVE_WORDS_RE = re.compile('execute|run|perform|always|must')
+
+# Inputs each protocol is assumed to expect from the protocol handing off to it
+INPUT_MAPPING = {
+    "0": ["project overview", "requirements", "context"],
+    "1": ["architecture context", "project setup"],
+    "2": ["prd", "requirements"],
+    "3": ["tasks", "execution plan"],
+    "4": ["artifacts", "test results"],
+    "5": ["audit report", "quality gates"]
+}
+
+MAX_WORKERS = 8
+
+# Reports written to a path with this suffix are zstd-compressed
+COMPRESSED_REPORT_SUFFIX = '.zst'
+ZSTD_LEVEL = 3
+
+# Per-protocol analyses of the last run, reused while a protocol's content and
+# this script are unchanged; bump the version when the cache layout changes
+ANALYSIS_CACHE_FILE = Path('.artifacts') / 'consistency_cache.json'
+ANALYSIS_CACHE_VERSION = 2
+
+
+def _read_protocol(protocol_path: Path) -> Optional[Union[str, Exception]]:
+    """Read a protocol file: None when it is missing, the error when it cannot be read."""
+    if not protocol_path.exists():
+        return None
+    try:
+        return protocol_path.read_text(encoding='utf-8')
+    except Exception as e:
+        return e
+
+
+def _write_report(report: Dict[str, Any], output_path: Path) -> None:
+    """Write a JSON report, zstd-compressing it when the path ends in .zst."""
+    data = dumps_pretty(report)
+    if output_path.suffix == COMPRESSED_REPORT_SUFFIX:
+        if zstandard is None:
+            raise SystemExit("Writing a .zst report requires the zstandard package")
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    output_path.write_bytes(data)
+
+
+@lru_cache(maxsize=None)
+def _alignment_keywords(items: Tuple[str, ...]) -> FrozenSet[str]:
+    """Return the lower-cased words of output or input names, splitting on hyphens."""
+    return frozenset(word for item in items for word in item.lower().replace('-', ' ').split())
+
+
+def _count_conflicting_pairs(must_polarities: List[Tuple[bool, bool]],
+                             strict_polarities: List[Tuple[bool, bool]]) -> int:
+    """Count MUST/STRICT pairs where one side is negative and the other positive.
+
+    Each polarity is a (negative, positive) pair. Pairs are counted from the
+    per-side totals instead of comparing every MUST with every STRICT.
+    """
+    must_negative = sum(negative for negative, _ in must_polarities)
+    must_positive = sum(positive for _, positive in must_polarities)
+    strict_negative = sum(negative for negative, _ in strict_polarities)
+    strict_positive = sum(positive for _, positive in strict_polarities)
+    # A directive that is both negative and positive conflicts with every
+    # directive on the other side that is also both; don't count it twice
+    both_must = sum(negative and positive for negative, positive in must_polarities)
+    both_strict = sum(negative and positive for negative, positive in strict_polarities)
+    return must_negative * strict_positive + must_positive * strict_negative - both_must * both_strict
+
 
 class ConsistencyReportGenerator:
     """Generates comprehensive consistency reports."""
     
-    def __init__(self, workspace_root: str = "."):
+    def __init__(self, workspace_root: str = ".", use_cache: bool = True):
         self.workspace_root = Path(workspace_root)
         self.ai_driven_workflow_dir = self.workspace_root / ".cursor" / "ai-driven-workflow"
+        self.analysis_cache_path = self.workspace_root / ANALYSIS_CACHE_FILE if use_cache else None
         
         # Protocol files
         self.protocols = {
@@ -36,6 +167,10 @@ class ConsistencyReportGenerator:
             "4": "4-quality-audit.md",
             "5": "5-implementation-retrospective.md"
         }
+        self._protocol_paths = {
+            protocol_id: self.ai_driven_workflow_dir / protocol_file
+            for protocol_id, protocol_file in self.protocols.items()
+        }
         
         # Protocol metadata
         self.protocol_metadata = {
@@ -89,9 +224,16 @@ class ConsistencyReportGenerator:
                 "next_protocol": None
             }
         }
+        
+        # Line start offsets of the most recently analyzed content
+        self._line_index_cache: Optional[Tuple[str, List[int]]] = None
     
-    def generate_consistency_report(self) -> Dict[str, Any]:
-        """Generate comprehensive consistency report."""
+    def generate_consistency_report(self, summary_only: bool = False) -> Dict[str, Any]:
+        """Generate comprehensive consistency report.
+        
+        With summary_only, the flow map and conflict report sections, which feed
+        neither the consistency score nor the recommendations, are left empty.
+        """
         report = {
             "generated_at": datetime.now().isoformat(),
             "workspace": str(self.workspace_root),
@@ -112,12 +254,19 @@ class ConsistencyReportGenerator:
             "issues": []
         }
         
-        # Analyze each protocol
+        # Read the protocol files concurrently, then analyze them in order
+        protocol_paths = self._protocol_paths
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(protocol_paths)))) as executor:
+            protocol_contents = dict(zip(protocol_paths, executor.map(_read_protocol, protocol_paths.values())))
+        
+        # Analyze each protocol; those whose content matches the last run reuse its analysis
         protocol_data = {}
+        cache = self._load_analysis_cache()
+        updated_cache: Dict[str, Any] = {}
         for protocol_id, protocol_file in self.protocols.items():
-            protocol_path = self.dev_workflow_dir / protocol_file
-            
-            if not protocol_path.exists():
+            protocol_path = protocol_paths[protocol_id]
+            content = protocol_contents[protocol_id]
+            if content is None:
                 report["issues"].append({
                     "severity": "critical",
                     "protocol": f"protocol_{protocol_id}",
@@ -127,8 +276,15 @@ class ConsistencyReportGenerator:
                 continue
             
             try:
-                content = protocol_path.read_text(encoding='utf-8')
-                protocol_analysis = self._analyze_protocol(protocol_id, content)
+                if isinstance(content, Exception):
+                    raise content
+                digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+                cached = cache.get(protocol_id)
+                if isinstance(cached, dict) and cached.get("sha256") == digest:
+                    protocol_analysis = cached["analysis"]
+                else:
+                    protocol_analysis = self._analyze_protocol(protocol_id, content)
+                updated_cache[protocol_id] = {"sha256": digest, "analysis": protocol_analysis}
                 protocol_data[protocol_id] = protocol_analysis
                 report["summary"]["analyzed"] += 1
                 
@@ -140,11 +296,16 @@ class ConsistencyReportGenerator:
                     "fix": "Check file permissions and encoding"
                 })
         
+        if updated_cache != cache:
+            self._save_analysis_cache(updated_cache)
+        
         # Generate report sections
-        report["protocol_flow_map"] = self._generate_protocol_flow_map(protocol_data)
+        if not summary_only:
+            report["protocol_flow_map"] = self._generate_protocol_flow_map(protocol_data)
         report["directive_consistency_matrix"] = self._generate_directive_matrix(protocol_data)
         report["ai_persona_transitions"] = self._generate_persona_transitions(protocol_data)
-        report["instruction_conflict_report"] = self._generate_conflict_report(protocol_data)
+        if not summary_only:
+            report["instruction_conflict_report"] = self._generate_conflict_report(protocol_data)
         report["handoff_alignment"] = self._generate_handoff_alignment(protocol_data)
         report["execution_simulation"] = self._generate_execution_simulation(protocol_data)
         
@@ -156,8 +317,21 @@ class ConsistencyReportGenerator:
         
         return report
     
+    def _load_analysis_cache(self) -> Dict[str, Any]:
+        """Load cached per-protocol analyses, or nothing if they came from other code."""
+        if self.analysis_cache_path is None:
+            return {}
+        return load_cache(self.analysis_cache_path, source_key(ANALYSIS_CACHE_VERSION, Path(__file__)), "protocols")
+    
+    def _save_analysis_cache(self, protocols: Dict[str, Any]) -> None:
+        """Write the per-protocol analyses for the next run."""
+        if self.analysis_cache_path is None:
+            return
+        save_cache(self.analysis_cache_path, source_key(ANALYSIS_CACHE_VERSION, Path(__file__)), "protocols", protocols)
+    
     def _analyze_protocol(self, protocol_id: str, content: str) -> Dict[str, Any]:
         """Analyze a single protocol for consistency."""
+        lowered = self._lowered_for_counting(content)
         analysis = {
             "protocol_id": protocol_id,
             "metadata": self.protocol_metadata.get(protocol_id, {}),
@@ -165,10 +339,11 @@ class ConsistencyReportGenerator:
             "phases": self._extract_phases(content),
             "directives": self._extract_directives(content),
             "persona_info": self._extract_persona_info(content),
-            "gates": self._extract_gates(content),
+            # Only the number of gates and hooks is reported, so skip building their entries
+            "gates_count": self._count_matches(GATE_RES, GATE_LOWER_RES, content, lowered),
             "outputs": self._extract_outputs(content),
             "handoff_instructions": self._extract_handoff_instructions(content),
-            "automation_hooks": self._extract_automation_hooks(content),
+            "automation_hooks_count": self._count_matches(AUTOMATION_RES, AUTOMATION_LOWER_RES, content, lowered),
             "issues": []
         }
         
@@ -178,31 +353,36 @@ class ConsistencyReportGenerator:
         """Extract steps from protocol content."""
         steps = []
         
-        step_pattern = r'###\s*STEP\s+(\d+(?:\.\d+)*):\s*(.*)'
-        
-        for match in re.finditer(step_pattern, content, re.IGNORECASE):
+        for match in STEP_RE.finditer(content):
             steps.append({
                 "number": match.group(1),
                 "title": match.group(2).strip(),
-                "line_number": content[:match.start()].count('\n') + 1
+                "line_number": self._line_number(content, match.start())
             })
         
-        return sorted(steps, key=lambda x: [int(part) for part in x["number"].split('.')])
+        return self._in_number_order(steps)
     
     def _extract_phases(self, content: str) -> List[Dict[str, Any]]:
         """Extract phases from protocol content."""
         phases = []
         
-        phase_pattern = r'###\s*PHASE\s+(\d+(?:\.\d+)*):\s*(.*)'
-        
-        for match in re.finditer(phase_pattern, content, re.IGNORECASE):
+        for match in PHASE_RE.finditer(content):
             phases.append({
                 "number": match.group(1),
                 "title": match.group(2).strip(),
-                "line_number": content[:match.start()].count('\n') + 1
+                "line_number": self._line_number(content, match.start())
             })
         
-        return sorted(phases, key=lambda x: [int(part) for part in x["number"].split('.')])
+        return self._in_number_order(phases)
+    
+    def _in_number_order(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order numbered steps or phases by number, keeping document order when it already is."""
+        keys = [tuple(int(part) for part in entry["number"].split('.')) for entry in entries]
+        if all(keys[i] <= keys[i + 1] for i in range(len(keys) - 1)):
+            return entries
+        
+        order = sorted(range(len(entries)), key=keys.__getitem__)
+        return [entries[i] for i in order]
     
     def _extract_directives(self, content: str) -> Dict[str, List[Dict[str, Any]]]:
         """Extract directives from protocol content."""
@@ -215,22 +395,11 @@ class ConsistencyReportGenerator:
             "OPTIONAL": []
         }
         
-        directive_patterns = {
-            "MUST": r'\[MUST\]',
-            "GUIDELINE": r'\[GUIDELINE\]',
-            "STRICT": r'\[STRICT\]',
-            "CRITICAL": r'\[CRITICAL\]',
-            "REQUIRED": r'\[REQUIRED\]',
-            "OPTIONAL": r'\[OPTIONAL\]'
-        }
-        
-        for tag, pattern in directive_patterns.items():
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                directives[tag].append({
-                    "line_number": content[:match.start()].count('\n') + 1,
-                    "context": self._extract_context(content, match.start(), match.end())
-                })
+        for match in DIRECTIVE_RE.finditer(content):
+            directives[match.lastgroup].append({
+                "line_number": self._line_number(content, match.start()),
+                "context": self._extract_context(content, match.start(), match.end())
+            })
         
         return directives
     
@@ -243,69 +412,41 @@ class ConsistencyReportGenerator:
         }
         
         # Look for AI Persona section
-        persona_pattern = r'##\s*AI\s+Persona\s*\n(.*?)(?=\n##|\n---|\Z)'
-        match = re.search(persona_pattern, content, re.IGNORECASE | re.DOTALL)
+        match = PERSONA_SECTION_RE.search(content)
         
         if match:
             persona_info["declared"] = {
                 "content": match.group(1).strip(),
-                "line_number": content[:match.start()].count('\n') + 1
+                "line_number": self._line_number(content, match.start())
             }
         
         # Look for role mentions
-        role_pattern = r'(?:Role|Act as|You are)\s*:?\s*(.*?)(?:\n|$)'
-        role_matches = re.finditer(role_pattern, content, re.IGNORECASE)
+        role_matches = ROLE_RE.finditer(content)
         
         for match in role_matches:
             persona_info["role_mentions"].append({
                 "content": match.group(1).strip(),
-                "line_number": content[:match.start()].count('\n') + 1
+                "line_number": self._line_number(content, match.start())
             })
         
         return persona_info
     
-    def _extract_gates(self, content: str) -> List[Dict[str, Any]]:
-        """Extract gates from protocol content."""
-        gates = []
-        
-        gate_patterns = [
-            r'Gate\s*:?\s*(.*?)(?:\n|$)',
-            r'Pass\s+Criteria\s*:?\s*(.*?)(?:\n|$)',
-            r'Validation\s+Threshold\s*:?\s*(.*?)(?:\n|$)',
-            r'Score\s*≥\s*(\d+)',
-            r'≥\s*(\d+)'
-        ]
-        
-        for pattern in gate_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                gates.append({
-                    "criteria": match.group(1) if len(match.groups()) > 0 else match.group(0),
-                    "line_number": content[:match.start()].count('\n') + 1,
-                    "context": self._extract_context(content, match.start(), match.end())
-                })
-        
-        return gates
-    
     def _extract_outputs(self, content: str) -> List[Dict[str, Any]]:
         """Extract outputs from protocol content."""
         outputs = []
         
-        output_patterns = [
-            r'generate\s+(?:a\s+)?([a-zA-Z0-9\-_]+\.(?:md|json|yaml|yml|txt))',
-            r'create\s+(?:a\s+)?([a-zA-Z0-9\-_]+\.(?:md|json|yaml|yml|txt))',
-            r'output\s+(?:a\s+)?([a-zA-Z0-9\-_]+\.(?:md|json|yaml|yml|txt))',
-            r'produce\s+(?:a\s+)?([a-zA-Z0-9\-_]+\.(?:md|json|yaml|yml|txt))'
-        ]
-        
-        for pattern in output_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                outputs.append({
-                    "file": match.group(1),
-                    "line_number": content[:match.start()].count('\n') + 1,
-                    "context": self._extract_context(content, match.start(), match.end())
-                })
+        # One scan for all verbs, reported grouped by verb in OUTPUT_VERBS order
+        outputs_by_verb: Dict[str, List[Dict[str, Any]]] = {verb: [] for verb in OUTPUT_VERBS}
+        for match in OUTPUT_RE.finditer(content):
+            verb = next(verb for verb in OUTPUT_VERBS if match.group(verb) is not None)
+            outputs_by_verb[verb].append({
+                "file": match.group("file"),
+                "line_number": self._line_number(content, match.start()),
+                "context_span": self._context_span(content, match.start())
+            })
+        
+        for verb_outputs in outputs_by_verb.values():
+            outputs.extend(verb_outputs)
         
         return outputs
     
@@ -313,55 +454,73 @@ class ConsistencyReportGenerator:
         """Extract handoff instructions."""
         instructions = []
         
-        handoff_patterns = [
-            r'handoff\s+(?:to\s+)?(?:protocol\s+)?(\d+)',
-            r'proceed\s+(?:to\s+)?(?:protocol\s+)?(\d+)',
-            r'continue\s+(?:to\s+)?(?:protocol\s+)?(\d+)',
-            r'next\s+(?:protocol\s+)?(\d+)'
-        ]
-        
-        for pattern in handoff_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                instructions.append({
-                    "target": match.group(1) if match.groups() else None,
-                    "line_number": content[:match.start()].count('\n') + 1,
-                    "context": self._extract_context(content, match.start(), match.end())
-                })
+        # One scan for all keywords, reported grouped by keyword in HANDOFF_KEYWORDS order
+        instructions_by_keyword: Dict[str, List[Dict[str, Any]]] = {keyword: [] for keyword in HANDOFF_KEYWORDS}
+        for match in HANDOFF_RE.finditer(content):
+            keyword = next(keyword for keyword in HANDOFF_KEYWORDS if match.group(keyword) is not None)
+            instructions_by_keyword[keyword].append({
+                "target": match.group("next_target" if keyword == "next" else "target"),
+                "line_number": self._line_number(content, match.start()),
+                "context_span": self._context_span(content, match.start())
+            })
+        
+        for keyword_instructions in instructions_by_keyword.values():
+            instructions.extend(keyword_instructions)
         
         return instructions
     
-    def _extract_automation_hooks(self, content: str) -> List[Dict[str, Any]]:
-        """Extract automation hooks."""
-        hooks = []
-        
-        automation_patterns = [
-            r'\[AUTOMATION\]',
-            r'automation\s+hook',
-            r'script\s+execution',
-            r'workflow\s+integration'
-        ]
-        
-        for pattern in automation_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                hooks.append({
-                    "type": "automation",
-                    "line_number": content[:match.start()].count('\n') + 1,
-                    "context": self._extract_context(content, match.start(), match.end())
-                })
-        
-        return hooks
+    def _lowered_for_counting(self, content: str) -> Optional[str]:
+        """Return content lower-cased for case-sensitive counting, or None if that could miscount."""
+        if any(char in content for char in CASE_FOLD_EXCEPTIONS):
+            return None
+        return content.lower()
+    
+    def _count_matches(self, patterns: List[re.Pattern], lower_patterns: List[re.Pattern],
+                       content: str, lowered: Optional[str]) -> int:
+        """Count the matches of several patterns without building entries for them.
+        
+        Literal runs in the case-sensitive lower_patterns are found with a fast
+        substring search, which IGNORECASE patterns can't use, so they run over
+        the lowered content when there is one.
+        """
+        if lowered is not None:
+            patterns, content = lower_patterns, lowered
+        return sum(1 for pattern in patterns for _ in pattern.finditer(content))
+    
+    def _line_index(self, content: str) -> List[int]:
+        """Return the start offset of every line, computed once per content."""
+        cached = self._line_index_cache
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        
+        line_starts = [0]
+        line_starts.extend(match.end() for match in NEWLINE_RE.finditer(content))
+        self._line_index_cache = (content, line_starts)
+        return line_starts
+    
+    def _line_number(self, content: str, position: int) -> int:
+        """Return the 1-based line number of an offset in content."""
+        return bisect.bisect_right(self._line_index(content), position)
+    
+    def _context_span(self, content: str, start: int, context_lines: int = 2) -> List[int]:
+        """Return the first and last 1-based line numbers of the context around a match.
+        
+        Entries that are only counted record this instead of a copy of the text.
+        """
+        line_count = len(self._line_index(content))
+        match_line = self._line_number(content, start) - 1
+        return [max(0, match_line - context_lines) + 1, min(line_count, match_line + context_lines + 1)]
     
     def _extract_context(self, content: str, start: int, end: int, context_lines: int = 2) -> str:
         """Extract context around a match."""
-        lines = content.split('\n')
-        match_line = content[:start].count('\n')
+        line_starts = self._line_index(content)
+        match_line = bisect.bisect_right(line_starts, start) - 1
         
         start_line = max(0, match_line - context_lines)
-        end_line = min(len(lines), match_line + context_lines + 1)
+        end_line = match_line + context_lines + 1
+        context_end = line_starts[end_line] - 1 if end_line < len(line_starts) else len(content)
         
-        return '\n'.join(lines[start_line:end_line])
+        return content[line_starts[start_line]:context_end]
     
     def _generate_protocol_flow_map(self, protocol_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate protocol flow map."""
@@ -380,9 +539,9 @@ class ConsistencyReportGenerator:
                 "purpose": metadata.get("purpose", "Unknown"),
                 "steps_count": len(data["steps"]),
                 "phases_count": len(data["phases"]),
-                "gates_count": len(data["gates"]),
+                "gates_count": data["gates_count"],
                 "outputs_count": len(data["outputs"]),
-                "automation_hooks_count": len(data["automation_hooks"])
+                "automation_hooks_count": data["automation_hooks_count"]
             }
             
             # Add transitions
@@ -395,17 +554,17 @@ class ConsistencyReportGenerator:
                 })
             
             # Add automation points
-            if data["automation_hooks"]:
+            if data["automation_hooks_count"]:
                 flow_map["automation_points"].append({
                     "protocol": protocol_id,
-                    "hooks": len(data["automation_hooks"])
+                    "hooks": data["automation_hooks_count"]
                 })
             
             # Add gate checkpoints
-            if data["gates"]:
+            if data["gates_count"]:
                 flow_map["gate_checkpoints"].append({
                     "protocol": protocol_id,
-                    "gates": len(data["gates"])
+                    "gates": data["gates_count"]
                 })
         
         return flow_map
@@ -419,19 +578,16 @@ class ConsistencyReportGenerator:
             "issues": []
         }
         
-        # Count total usage
-        total_directives = {tag: 0 for tag in ["MUST", "GUIDELINE", "STRICT", "CRITICAL", "REQUIRED", "OPTIONAL"]}
+        # Count total usage; every tag is listed, including unused ones
+        total_directives = Counter(dict.fromkeys(DIRECTIVE_TAGS, 0))
         
         for protocol_id, data in protocol_data.items():
-            protocol_usage = {}
-            for tag, occurrences in data["directives"].items():
-                count = len(occurrences)
-                protocol_usage[tag] = count
-                total_directives[tag] += count
+            protocol_usage = {tag: len(occurrences) for tag, occurrences in data["directives"].items()}
+            total_directives.update(protocol_usage)
             
             matrix["protocol_usage"][protocol_id] = protocol_usage
         
-        matrix["total_usage"] = total_directives
+        matrix["total_usage"] = dict(total_directives)
         
         # Calculate consistency scores
         total_count = sum(total_directives.values())
@@ -520,40 +676,33 @@ class ConsistencyReportGenerator:
             strict_directives = data["directives"]["STRICT"]
             
             if len(must_directives) > 0 and len(strict_directives) > 0:
-                # Check for potential conflicts
-                for must_directive in must_directives:
-                    for strict_directive in strict_directives:
-                        if self._check_directive_conflict(must_directive["context"], strict_directive["context"]):
-                            conflict_report["contradictions"].append({
-                                "protocol": protocol_id,
-                                "type": "must_strict_conflict",
-                                "message": "Potential conflict between MUST and STRICT directives",
-                                "severity": "warning"
-                            })
+                # Count conflicting MUST/STRICT pairs from each directive's polarity
+                conflicts = _count_conflicting_pairs(
+                    [self._directive_polarity(directive["context"]) for directive in must_directives],
+                    [self._directive_polarity(directive["context"]) for directive in strict_directives],
+                )
+                
+                if conflicts > 0:
+                    conflict_report["contradictions"].append({
+                        "protocol": protocol_id,
+                        "type": "must_strict_conflict",
+                        "count": conflicts,
+                        "message": f"Potential conflict between MUST and STRICT directives ({conflicts} directive pairs)",
+                        "severity": "warning"
+                    })
         
         conflict_report["total_conflicts"] = (
-            len(conflict_report["contradictions"]) +
+            sum(contradiction["count"] for contradiction in conflict_report["contradictions"]) +
             len(conflict_report["ambiguities"]) +
             len(conflict_report["completeness_issues"])
         )
         
         return conflict_report
     
-    def _check_directive_conflict(self, context1: str, context2: str) -> bool:
-        """Check if two directive contexts conflict."""
-        # Simple conflict detection - could be enhanced
-        negative_words = ["skip", "ignore", "avoid", "never", "not"]
-        positive_words = ["execute", "run", "perform", "always", "must"]
-        
-        context1_lower = context1.lower()
-        context2_lower = context2.lower()
-        
-        has_negative1 = any(word in context1_lower for word in negative_words)
-        has_positive1 = any(word in context1_lower for word in positive_words)
-        has_negative2 = any(word in context2_lower for word in negative_words)
-        has_positive2 = any(word in context2_lower for word in positive_words)
-        
-        return (has_negative1 and has_positive2) or (has_positive1 and has_negative2)
+    def _directive_polarity(self, context: str) -> Tuple[bool, bool]:
+        """Return whether a directive context reads as negative and as positive."""
+        context_lower = context.lower()
+        return bool(NEGATIVE_WORDS_RE.search(context_lower)), bool(POSITIVE_WORDS_RE.search(context_lower))
     
     def _generate_handoff_alignment(self, protocol_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate handoff alignment analysis."""
@@ -596,16 +745,7 @@ class ConsistencyReportGenerator:
     def _infer_next_inputs(self, protocol_id: str, metadata: Dict[str, Any]) -> List[str]:
         """Infer inputs for next protocol."""
         # This is a simplified inference - could be enhanced
-        input_mapping = {
-            "0": ["project overview", "requirements", "context"],
-            "1": ["architecture context", "project setup"],
-            "2": ["prd", "requirements"],
-            "3": ["tasks", "execution plan"],
-            "4": ["artifacts", "test results"],
-            "5": ["audit report", "quality gates"]
-        }
-        
-        return input_mapping.get(protocol_id, [])
+        return list(INPUT_MAPPING.get(protocol_id, []))
     
     def _calculate_alignment_score(self, outputs: List[str], inputs: List[str]) -> float:
         """Calculate alignment score between outputs and inputs."""
@@ -613,16 +753,11 @@ class ConsistencyReportGenerator:
             return 0.0
         
         # Simple keyword matching
-        output_keywords = set()
-        for output in outputs:
-            output_keywords.update(output.lower().replace('-', ' ').split())
-        
-        input_keywords = set()
-        for input_item in inputs:
-            input_keywords.update(input_item.lower().replace('-', ' ').split())
+        output_keywords = _alignment_keywords(tuple(outputs))
+        input_keywords = _alignment_keywords(tuple(inputs))
         
-        overlap = len(output_keywords.intersection(input_keywords))
-        total = len(output_keywords.union(input_keywords))
+        overlap = len(output_keywords & input_keywords)
+        total = len(output_keywords | input_keywords)
         
         return overlap / total if total > 0 else 0.0
     
@@ -641,8 +776,8 @@ class ConsistencyReportGenerator:
         for protocol_id, data in protocol_data.items():
             # Simulate basic execution
             steps_count = len(data["steps"])
-            gates_count = len(data["gates"])
-            automation_hooks = len(data["automation_hooks"])
+            gates_count = data["gates_count"]
+            automation_hooks = data["automation_hooks_count"]
             
             # Simple success criteria
             has_steps = steps_count > 0
@@ -745,14 +880,17 @@ def main():
     """Main entry point for consistency report generation."""
     parser = argparse.ArgumentParser(description="Generate comprehensive consistency report")
     parser.add_argument("--workspace", "-w", default=".", help="Workspace root directory")
-    parser.add_argument("--output", "-o", help="Output file for report (JSON)")
+    parser.add_argument("--output", "-o", help="Output file for report (JSON; zstd-compressed when it ends in .zst)")
     parser.add_argument("--markdown", "-m", help="Output file for markdown report")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument("--no-cache", action="store_true", help="Reanalyze every protocol instead of reusing cached analyses")
+    parser.add_argument("--summary-only", action="store_true",
+                        help="Skip the flow map and conflict report sections; score and recommendations are unchanged")
     
     args = parser.parse_args()
     
-    generator = ConsistencyReportGenerator(args.workspace)
-    report = generator.generate_consistency_report()
+    generator = ConsistencyReportGenerator(args.workspace, use_cache=not args.no_cache)
+    report = generator.generate_consistency_report(summary_only=args.summary_only)
     
     # Output results
     if args.verbose or not args.output:
@@ -772,8 +910,7 @@ def main():
     
     # Save JSON report
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(report, f, indent=2)
+        _write_report(report, Path(args.output))
         print(f"Consistency report saved to: {args.output}")
     
     # Generate markdown report
@@ -10,23 +10,70 @@ automation is still under construction.
 from __future__ import annotations
 
 import argparse
-import json
-from datetime import datetime
+from dataclasses import asdict
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Sequence
+from typing import Dict, List, Sequence
 
 import inventory_protocols
+from json_io import atomic_write_bytes, dumps_pretty, load_cache, save_cache, source_key
 
 DEFAULT_OUTPUT_DIR = Path("documentation/sample-manifests")
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# Inventories of previous runs, reused while a protocol file's mtime and size are
+# unchanged and each script it references still exists or is still missing; kept
+# under the repository root whatever the working directory
+INVENTORY_CACHE_FILE = REPO_ROOT / ".artifacts" / "inventory_cache.json"
+INVENTORY_CACHE_VERSION = 1
+
+
+def _scripts_unchanged(inventory: inventory_protocols.ProtocolInventory, scripts_dir: Path) -> bool:
+    """True when every script the inventory found still exists and every missing one is still missing."""
+    return all((scripts_dir / script).exists() for script in inventory.existing_scripts) and not any(
+        (scripts_dir / script).exists() for script in inventory.missing_scripts
+    )
+
+
+def load_inventories(
+    protocol_paths: Sequence[Path], scripts_dir: Path, cache_path: Path = INVENTORY_CACHE_FILE
+) -> List[inventory_protocols.ProtocolInventory]:
+    """Build protocol inventories, reusing cached ones for files unchanged since the last run."""
+    cache_key = source_key(INVENTORY_CACHE_VERSION, Path(inventory_protocols.__file__))
+    cache = load_cache(cache_path, cache_key, "inventories")
+    scripts_root = str(scripts_dir.resolve())
+    updated: Dict[str, dict] = {}
+    inventories = []
+    for path in protocol_paths:
+        entry_key = str(path.resolve())
+        stat = path.stat()
+        key = [stat.st_mtime_ns, stat.st_size, scripts_root]
+        entry = cache.get(entry_key)
+        inventory = None
+        if isinstance(entry, dict) and entry.get("key") == key:
+            try:
+                inventory = inventory_protocols.ProtocolInventory(**entry["inventory"])
+            except (KeyError, TypeError):
+                inventory = None
+            # Referenced scripts can live in subdirectories, so no directory
+            # mtime covers them; re-stat each one instead
+            if inventory is not None and not _scripts_unchanged(inventory, scripts_dir):
+                inventory = None
+        if inventory is None:
+            inventory = inventory_protocols.build_inventory(path, scripts_dir)
+        updated[entry_key] = {"key": key, "inventory": asdict(inventory)}
+        inventories.append(inventory)
+    if updated != cache:
+        save_cache(cache_path, cache_key, "inventories", {**cache, **updated})
+    return inventories
 
 
 def _parse_artifact(value: str) -> dict:
-    try:
-        path, status, description = value.split("::", 2)
-    except ValueError as exc:  # pragma: no cover - defensive parsing guard
+    path, _, rest = value.partition("::")
+    status, sep, description = rest.partition("::")
+    if not sep:
         raise argparse.ArgumentTypeError(
             "artifact must use format path::status::description"
-        ) from exc
+        )
     return {
         "path": path,
         "status": status,
@@ -35,12 +82,13 @@ def _parse_artifact(value: str) -> dict:
 
 
 def _parse_validator(value: str) -> dict:
-    try:
-        name, command, status, notes = value.split("::", 3)
-    except ValueError as exc:  # pragma: no cover - defensive parsing guard
+    name, _, rest = value.partition("::")
+    command, _, rest = rest.partition("::")
+    status, sep, notes = rest.partition("::")
+    if not sep:
         raise argparse.ArgumentTypeError(
             "validator must use format name::command::status::notes"
-        ) from exc
+        )
     return {
         "name": name,
         "command": command,
@@ -94,35 +142,36 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
 
 def main(argv: Sequence[str] | None = None) -> int:
     args = parse_args(argv)
-    inventories: List[inventory_protocols.ProtocolInventory] = [
-        inventory_protocols.build_inventory(path, args.scripts_dir)
+    protocol = args.protocol
+    # Only the requested protocol is inventoried; when several files share an
+    # id the last one in sorted order wins, as with the former full lookup.
+    matches = [
+        path
         for path in inventory_protocols.discover_protocol_files(args.protocol_dir)
+        if path.name.split("-", 1)[0] == protocol
     ]
-    lookup = {item.protocol.split("-", 1)[0]: item for item in inventories}
-
-    protocol = args.protocol
-    if protocol not in lookup:
+    if not matches:
         raise SystemExit(f"Unknown protocol id: {protocol}")
 
-    inventory = lookup[protocol]
+    (inventory,) = load_inventories(matches[-1:], args.scripts_dir)
     referenced = sorted(set(inventory.existing_scripts + inventory.missing_scripts))
     manifest = {
         "protocol_id": protocol,
         "protocol_title": inventory.title,
-        "generated_at": datetime.utcnow().isoformat() + "Z",
-    }
-    manifest["automation_coverage"] = {
-        "referenced_scripts": referenced,
-        "missing_scripts": inventory.missing_scripts,
-        "coverage": round(inventory.coverage, 3),
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "automation_coverage": {
+            "referenced_scripts": referenced,
+            "missing_scripts": inventory.missing_scripts,
+            "coverage": round(inventory.coverage, 3),
+        },
+        "artifacts": args.artifact,
+        "validators": args.validator,
+        "notes": args.notes,
     }
-    manifest["artifacts"] = args.artifact
-    manifest["validators"] = args.validator
-    manifest["notes"] = args.notes
 
     args.output_dir.mkdir(parents=True, exist_ok=True)
     output_path = args.output_dir / f"protocol-{protocol}.manifest.json"
-    output_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    atomic_write_bytes(output_path, dumps_pretty(manifest))
     print(f"Wrote manifest: {output_path}")
     return 0
 
@@ -13,36 +13,47 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
-import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import sys
 import shlex
 
-from project_generator.core.brief_parser import BriefParser
+from json_io import atomic_write_bytes, load_cache, save_cache, source_key
+from project_generator.core.brief_parser import BriefParser, ScaffoldSpec
 
 
 FRONTEND_RULES = {
-    "nextjs": ["nextjs.mdc", "nextjs-formatting.mdc", "nextjs-rsc-and-client.mdc", "typescript.mdc"],
-    "angular": ["angular.mdc", "typescript.mdc"],
-    "nuxt": ["vue.mdc", "typescript.mdc"],
-    "expo": ["expo.mdc", "react-native.mdc", "typescript.mdc"],
+    "nextjs": ("nextjs.mdc", "nextjs-formatting.mdc", "nextjs-rsc-and-client.mdc", "typescript.mdc"),
+    "angular": ("angular.mdc", "typescript.mdc"),
+    "nuxt": ("vue.mdc", "typescript.mdc"),
+    "expo": ("expo.mdc", "react-native.mdc", "typescript.mdc"),
 }
 
 BACKEND_RULES = {
-    "fastapi": ["fastapi.mdc", "python.mdc", "rest-api.mdc", "open-api.mdc"],
-    "django": ["django.mdc", "python.mdc", "rest-api.mdc", "open-api.mdc"],
-    "nestjs": ["nodejs.mdc", "typescript.mdc", "rest-api.mdc", "open-api.mdc"],
-    "go": ["golang.mdc", "nethttp.mdc", "rest-api.mdc", "open-api.mdc"],
+    "fastapi": ("fastapi.mdc", "python.mdc", "rest-api.mdc", "open-api.mdc"),
+    "django": ("django.mdc", "python.mdc", "rest-api.mdc", "open-api.mdc"),
+    "nestjs": ("nodejs.mdc", "typescript.mdc", "rest-api.mdc", "open-api.mdc"),
+    "go": ("golang.mdc", "nethttp.mdc", "rest-api.mdc", "open-api.mdc"),
 }
 
 DB_ADDONS = {
-    "mongodb": ["mongodb.mdc"],
-    "firebase": ["firebase.mdc"],
+    "mongodb": ("mongodb.mdc",),
+    "firebase": ("firebase.mdc",),
 }
 
+# Compliance regimes assumed for an industry when the brief lists none
+COMPLIANCE_BY_INDUSTRY = {
+    "ecommerce": ("pci", "gdpr"),
+    "finance": ("sox", "pci"),
+    "healthcare": ("hipaa",),
+}
+DEFAULT_COMPLIANCE = ("gdpr",)
+
 COMPLIANCE_RULES = {
     "hipaa": "industry-compliance-hipaa.mdc",
     "gdpr": "industry-compliance-gdpr.mdc",
@@ -50,41 +61,200 @@ COMPLIANCE_RULES = {
     "pci": "industry-compliance-pci.mdc",
 }
 
+# Fingerprint of the brief and options behind the last successful run, and the
+# files that run produced, kept in --output-root
+GENERATED_HASH_FILE = ".generate_from_brief.hash"
+# Directories under --output-root that never hold generated files
+OUTPUT_EXCLUDED_DIRS = frozenset((".git", ".artifacts", "_rules_manifests"))
+# Generator code and templates, relative to the repository root, whose changes
+# must trigger regeneration
+GENERATOR_INPUTS = ("scripts/generate_client_project.py", "project_generator", "template-packs")
+
+# Parsed briefs keyed by path, reused while the brief's mtime and size and the parser are unchanged
+SPEC_CACHE_FILE = Path(".artifacts") / "brief_spec_cache.json"
+SPEC_CACHE_VERSION = 1
+
+# Upper bound on generator worker threads when --workers is not given
+DEFAULT_MAX_WORKERS = 8
+
 
 def write_rules_manifest(manifest_path: Path, names: List[str]) -> None:
     # Deduplicate while preserving order
-    seen = set()
-    ordered: List[str] = []
-    for n in names:
-        if n not in seen:
-            seen.add(n)
-            ordered.append(n)
+    ordered = list(dict.fromkeys(names))
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    manifest_path.write_text(json.dumps(ordered, indent=2), encoding="utf-8")
+    atomic_write_bytes(manifest_path, json.dumps(ordered, indent=2).encode("utf-8"))
 
 
 def build_fe_manifest(frontend: str, compliance: List[str]) -> List[str]:
-    rules = list(FRONTEND_RULES.get(frontend, []))
+    base = FRONTEND_RULES.get(frontend, ())
     # Domain rules (focused)
-    rules += [
-        "accessibility.mdc",
-        "nextjs-a11y.mdc" if frontend == "nextjs" else None,
-    ]
-    return [r for r in rules if r]
+    extras = ("accessibility.mdc",) + (("nextjs-a11y.mdc",) if frontend == "nextjs" else ())
+    return list(dict.fromkeys((*base, *extras)))
 
 
 def build_be_manifest(backend: str, database: str, compliance: List[str]) -> List[str]:
-    rules = list(BACKEND_RULES.get(backend, []))
-    rules += DB_ADDONS.get(database, [])
+    base = BACKEND_RULES.get(backend, ())
+    addons = DB_ADDONS.get(database, ())
     # Domain rules common to backends (focused)
-    rules += [
-        "performance.mdc",
-        "observability.mdc",
-    ]
-    return rules
+    extras = ("performance.mdc", "observability.mdc")
+    return list(dict.fromkeys((*base, *addons, *extras)))
+
+
+def load_spec(brief: Path, cache_path: Path | None) -> ScaffoldSpec:
+    """Parse ``brief``, reusing the spec cached at ``cache_path`` for an unchanged file.
+
+    Pass ``cache_path=None`` to always parse from scratch.
+    """
+    if cache_path is None:
+        return BriefParser(brief).parse()
+    stat = brief.stat()
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    cache_key = source_key(SPEC_CACHE_VERSION, Path(sys.modules[BriefParser.__module__].__file__))
+    cache = load_cache(cache_path, cache_key, "briefs")
+    entry_key = str(brief.resolve())
+    entry = cache.get(entry_key)
+    if isinstance(entry, dict) and entry.get("stamp") == stamp:
+        try:
+            return ScaffoldSpec(**entry["spec"])
+        except (KeyError, TypeError):
+            pass
+    spec = BriefParser(brief).parse()
+    cache[entry_key] = {"stamp": stamp, "spec": asdict(spec)}
+    save_cache(cache_path, cache_key, "briefs", cache)
+    return spec
+
+
+def generator_digest(repo_root: Path) -> str:
+    """Hash the generator script, its package and the template packs it copies from."""
+    h = hashlib.blake2b(digest_size=16)
+    for name in GENERATOR_INPUTS:
+        top = repo_root / name
+        paths = [top] if top.is_file() else sorted(
+            Path(root) / file
+            for root, dirs, files in os.walk(top)
+            if "__pycache__" not in Path(root).parts
+            for file in files
+        )
+        for path in paths:
+            h.update(str(path.relative_to(repo_root)).encode("utf-8"))
+            h.update(os.readlink(path).encode("utf-8") if path.is_symlink() else path.read_bytes())
+    return h.hexdigest()
+
+
+def brief_fingerprint(args: argparse.Namespace, repo_root: Path) -> str:
+    """Hash the brief, the CLI options, this script and the generator inputs into a short hex digest."""
+    options = {k: v for k, v in vars(args).items() if k not in ("force", "no_cache")}
+    h = hashlib.blake2b(digest_size=16)
+    h.update(Path(args.brief).read_bytes())
+    h.update(repr(sorted(options.items())).encode("utf-8"))
+    h.update(Path(__file__).read_bytes())
+    h.update(generator_digest(repo_root).encode("ascii"))
+    return h.hexdigest()
+
+
+def snapshot_files(output_root: Path, roots: List[Path]) -> Dict[str, Tuple[int, int]]:
+    """Map the files under ``roots``, relative to ``output_root``, to their mtime and size.
+
+    VCS metadata, caches, rules manifests, this script's bookkeeping and trees
+    still being removed in the background are left out; none are generator output.
+    """
+    files = {}
+    for top in roots:
+        for root, dirs, names in os.walk(top):
+            dirs[:] = [d for d in dirs if d not in OUTPUT_EXCLUDED_DIRS and ".removing-" not in d]
+            for name in names:
+                path = Path(root) / name
+                if path.parent == output_root and name == GENERATED_HASH_FILE:
+                    continue
+                try:
+                    st = path.lstat()
+                except OSError:
+                    continue
+                files[str(path.relative_to(output_root))] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+def changed_files(before: Dict[str, Tuple[int, int]], after: Dict[str, Tuple[int, int]]) -> List[str]:
+    """Files that are new in ``after`` or were rewritten since ``before`` was taken."""
+    return sorted(path for path, stamp in after.items() if before.get(path) != stamp)
+
+
+def record_generation(hash_path: Path, fingerprint: str, outputs: List[str]) -> None:
+    """Store the fingerprint of a successful run with the files it produced."""
+    save_cache(hash_path, fingerprint, "generation", {"outputs": outputs})
+
+
+def is_up_to_date(hash_path: Path, fingerprint: str) -> bool:
+    """True when the last run used the same fingerprint and every file it produced is still there."""
+    outputs = load_cache(hash_path, fingerprint, "generation").get("outputs")
+    if not isinstance(outputs, list) or not outputs:
+        return False
+    output_root = hash_path.parent
+    return all((output_root / path).exists() for path in outputs)
+
+
+def remove_in_background(path: Path) -> Future:
+    """Move ``path`` aside and delete it on a worker thread.
+
+    The rename frees the target name immediately, so the generator can start
+    while the old project tree is still being removed. Callers wait on the
+    returned future so that removal errors still surface.
+    """
+    import shutil
+
+    doomed = path.with_name(f".{path.name}.removing-{os.getpid()}")
+    path.rename(doomed)
+    executor = ThreadPoolExecutor(max_workers=1)
+    removal = executor.submit(shutil.rmtree, doomed)
+    executor.shutdown(wait=False)
+    return removal
+
+
+def sweep_removals(output_root: Path) -> None:
+    """Delete project trees left behind by an interrupted ``remove_in_background``."""
+    import shutil
+
+    for leftover in sorted(output_root.glob(".*.removing-*")):
+        try:
+            shutil.rmtree(leftover)
+        except OSError as e:
+            print(f"[WARN] could not remove leftover {leftover}: {e}")
+
+
+def generate_project_rules(project_dir: Path) -> int:
+    """Run the Generate Cursor Rules step in-process, as ``run_generate_rules.py --overwrite`` would."""
+    import run_generate_rules
+
+    try:
+        files = run_generate_rules.generate_rules(project_dir.resolve(), overwrite=True)
+    except Exception as e:
+        print(f"[ERROR] rules generation failed for {project_dir}: {e}")
+        return 1
+    print(json.dumps({"generated": files}, indent=2))
+    return 0
+
+
+def forwarded_flags(args: argparse.Namespace, *, in_place: bool, no_cursor_assets: bool) -> List[str]:
+    """Boolean options passed through to generate_client_project.py, in its usual order."""
+    flag_map = (
+        (in_place, "--in-place"),
+        (no_cursor_assets, "--no-cursor-assets"),
+        (args.include_cursor_assets, "--include-cursor-assets"),
+        (args.force, "--force"),
+    )
+    return [flag for cond, flag in flag_map if cond]
+
+
+def child_workers(requested: int | None) -> int:
+    """Worker threads to request from the generator; an explicit --workers value is passed as-is."""
+    if requested is not None:
+        return requested
+    return max(1, min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1))
 
 
 def run_argv(argv: list[str], cwd: Path | None = None) -> int:
+    import subprocess
+
     try:
         out = subprocess.run(argv, cwd=str(cwd) if cwd else None, check=False, text=True)
         return out.returncode
@@ -93,13 +263,75 @@ def run_argv(argv: list[str], cwd: Path | None = None) -> int:
         return 1
 
 
+def scaffold_project(
+    *,
+    args: argparse.Namespace,
+    spec: ScaffoldSpec,
+    tag: str,
+    name: str,
+    project_type: str,
+    frontend: str,
+    backend: str,
+    database: str,
+    manifest: List[str],
+    compliance: List[str],
+    python_bin: str,
+    output_root: Path,
+    repo_root: Path,
+) -> None:
+    """Generate a single frontend or backend project with its curated rules manifest.
+
+    Exits with the failing step's return code if the generator or the
+    post-scaffold rules step fails.
+    """
+    project_dir = output_root / name
+    removal = remove_in_background(project_dir) if project_dir.exists() and args.force else None
+    # Write manifest OUTSIDE the target project directory to avoid being deleted by generator --force
+    manifest_path = output_root / "_rules_manifests" / f"{name}.json"
+    write_rules_manifest(manifest_path, manifest)
+    argv = [
+        python_bin,
+        "scripts/generate_client_project.py",
+        "--name", name,
+        "--industry", spec.industry,
+        "--project-type", project_type,
+        "--frontend", frontend,
+        "--backend", backend,
+        "--database", database,
+        "--auth", spec.auth,
+        "--deploy", spec.deploy,
+        "--output-dir", str(output_root),
+        "--workers", str(child_workers(args.workers)),
+        "--rules-manifest", str(manifest_path),
+        "--skip-system-checks",
+        "--yes",
+    ]
+    if spec.features:
+        argv.extend(["--features", ",".join(spec.features)])
+    if compliance:
+        argv.extend(["--compliance", ",".join(compliance)])
+    argv.extend(forwarded_flags(args, in_place=args.in_place, no_cursor_assets=args.no_cursor_assets))
+    print(f"\n[{tag}] {' '.join(shlex.quote(x) for x in argv)}")
+    code = run_argv(argv, cwd=repo_root)
+    if removal is not None:
+        removal.result()
+    if code != 0:
+        raise SystemExit(code)
+    # Post-scaffold: run Generate Cursor Rules unless disabled or assets suppressed
+    if not args.no_post_generate_rules and not args.no_cursor_assets:
+        print(f"[{tag}][Rules] {project_dir}")
+        rc = generate_project_rules(project_dir)
+        if rc != 0:
+            raise SystemExit(rc)
+
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Generate separate FE/BE projects from brief.md with curated rules")
     p.add_argument("--brief", required=True, help="Path to brief.md")
     p.add_argument("--output-root", default=".", help="Root directory for generated projects (default: current repo)")
     p.add_argument("--force", action="store_true", help="Overwrite existing project directories")
     p.add_argument("--yes", action="store_true", help="Run non-interactively")
-    p.add_argument("--workers", type=int, default=8)
+    p.add_argument("--workers", type=int, default=None, help=f"Template worker threads for the generator (default: CPU count, at most {DEFAULT_MAX_WORKERS})")
     # Passthrough flags to child generator
     p.add_argument("--in-place", action="store_true", help="Generate into --output-root as-is (no redirect)")
     p.add_argument("--no-subdir", action="store_true", help="Place scaffold directly under --output-root (no <name>/ subfolder)")
@@ -107,6 +339,7 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--include-cursor-assets", dest="include_cursor_assets", action="store_true", help="Force emitting .cursor assets in generated projects")
     # Post-scaffold rule generation control (default: off when template has root .cursor)
     p.add_argument("--no-post-run-generate-rules", dest="no_post_generate_rules", action="store_true", help="Do not run Generate Cursor Rules after scaffolding")
+    p.add_argument("--no-cache", dest="no_cache", action="store_true", help="Reparse the brief and regenerate even if nothing changed since the last run")
     return p.parse_args()
 
 
@@ -117,8 +350,12 @@ def main() -> None:
     if not output_root.is_absolute():
         output_root = (repo_root / output_root).resolve()
     output_root.mkdir(parents=True, exist_ok=True)
+    sweep_removals(output_root)
+
+    fingerprint = brief_fingerprint(args, repo_root)
+    hash_path = output_root / GENERATED_HASH_FILE
 
-    spec = BriefParser(args.brief).parse()
+    spec = load_spec(Path(args.brief), None if args.no_cache else repo_root / SPEC_CACHE_FILE)
 
     # Use the same Python interpreter that launched this script
     python_bin = shlex.quote(os.environ.get("PYTHON", sys.executable or "python3"))
@@ -128,16 +365,13 @@ def main() -> None:
     be_name = f"{spec.name}-backend" if spec.backend != "none" else None
 
     # Determine compliance fallback if not provided
-    comp_list = list(spec.compliance)
-    if not comp_list:
-        if spec.industry == "ecommerce":
-            comp_list = ["pci", "gdpr"]
-        elif spec.industry == "finance":
-            comp_list = ["sox", "pci"]
-        elif spec.industry == "healthcare":
-            comp_list = ["hipaa"]
-        else:
-            comp_list = ["gdpr"]
+    comp_list = list(spec.compliance) or list(COMPLIANCE_BY_INDUSTRY.get(spec.industry, DEFAULT_COMPLIANCE))
+
+    # Skip regeneration when the same brief, options and generator already
+    # produced files that are all still in place
+    if not (args.force or args.no_cache) and is_up_to_date(hash_path, fingerprint):
+        print("[CACHE] Brief, options and generator unchanged since the last run; nothing to regenerate (use --force to rerun).")
+        return
 
     # If both FE and BE present, run a single fullstack generation into output_root
     if fe_name and be_name:
@@ -153,7 +387,7 @@ def main() -> None:
             "--auth", spec.auth,
             "--deploy", spec.deploy,
             "--output-dir", str(output_root),
-            "--workers", str(args.workers),
+            "--workers", str(child_workers(args.workers)),
             "--skip-system-checks",
             "--yes",
             "--in-place",
@@ -163,130 +397,53 @@ def main() -> None:
             fs_argv.extend(["--features", ",".join(spec.features)])
         if comp_list:
             fs_argv.extend(["--compliance", ",".join(comp_list)])
-        if args.no_cursor_assets and not args.include_cursor_assets:
-            fs_argv.append("--no-cursor-assets")
-        if args.include_cursor_assets:
-            fs_argv.append("--include-cursor-assets")
-        if args.force:
-            fs_argv.append("--force")
+        fs_argv.extend(forwarded_flags(
+            args, in_place=False, no_cursor_assets=args.no_cursor_assets and not args.include_cursor_assets
+        ))
         print(f"\n[FULLSTACK] {' '.join(shlex.quote(x) for x in fs_argv)}")
+        # output_root may be a shared tree (by default the repository itself), so
+        # only files the generator creates or rewrites count as its outputs
+        before = snapshot_files(output_root, [output_root])
         code = run_argv(fs_argv, cwd=repo_root)
         if code != 0:
             raise SystemExit(code)
+        outputs = changed_files(before, snapshot_files(output_root, [output_root]))
+        record_generation(hash_path, fingerprint, outputs)
         # In template mode (root .cursor present), skip post rules
         return
 
+    common = dict(args=args, spec=spec, python_bin=python_bin, output_root=output_root, repo_root=repo_root)
+
     # FE-only
     if fe_name and not be_name:
-        fe_dir = output_root / fe_name
-        if fe_dir.exists() and args.force:
-            import shutil
-            shutil.rmtree(fe_dir)
-        manifest = build_fe_manifest(spec.frontend, comp_list)
-        # Write manifest OUTSIDE the target project directory to avoid being deleted by generator --force
-        fe_manifest_path = output_root / "_rules_manifests" / f"{fe_name}.json"
-        write_rules_manifest(fe_manifest_path, manifest)
-        fe_argv = [
-            python_bin,
-            "scripts/generate_client_project.py",
-            "--name", fe_name,
-            "--industry", spec.industry,
-            "--project-type", "web",
-            "--frontend", spec.frontend,
-            "--backend", "none",
-            "--database", "none",
-            "--auth", spec.auth,
-            "--deploy", spec.deploy,
-            "--output-dir", str(output_root),
-            "--workers", str(args.workers),
-            "--rules-manifest", str(fe_manifest_path),
-            "--skip-system-checks",
-            "--yes",
-        ]
-        if spec.features:
-            fe_argv.extend(["--features", ",".join(spec.features)])
-        if args.in_place:
-            fe_argv.append("--in-place")
-        if args.no_cursor_assets:
-            fe_argv.append("--no-cursor-assets")
-        if args.include_cursor_assets:
-            fe_argv.append("--include-cursor-assets")
-        if args.force:
-            fe_argv.append("--force")
-        print(f"\n[FE] {' '.join(shlex.quote(x) for x in fe_argv)}")
-        code = run_argv(fe_argv, cwd=repo_root)
-        if code != 0:
-            raise SystemExit(code)
-        # Post-scaffold: run Generate Cursor Rules unless disabled or assets suppressed
-        if not args.no_post_generate_rules and not args.no_cursor_assets:
-            rules_argv = [
-                python_bin,
-                "scripts/run_generate_rules.py",
-                "--project-dir", str(output_root / fe_name),
-                "--overwrite",
-            ]
-            print(f"[FE][Rules] {' '.join(shlex.quote(x) for x in rules_argv)}")
-            rc = run_argv(rules_argv, cwd=repo_root)
-            if rc != 0:
-                raise SystemExit(rc)
-
-    # BE project (if any)
+        scaffold_project(
+            tag="FE",
+            name=fe_name,
+            project_type="web",
+            frontend=spec.frontend,
+            backend="none",
+            database="none",
+            manifest=build_fe_manifest(spec.frontend, comp_list),
+            compliance=[],
+            **common,
+        )
+
     # BE-only
     if be_name and not fe_name:
-        be_dir = output_root / be_name
-        if be_dir.exists() and args.force:
-            import shutil
-            shutil.rmtree(be_dir)
-        manifest = build_be_manifest(spec.backend, spec.database, comp_list)
-        # Write manifest OUTSIDE the target project directory to avoid being deleted by generator --force
-        be_manifest_path = output_root / "_rules_manifests" / f"{be_name}.json"
-        write_rules_manifest(be_manifest_path, manifest)
-        be_argv = [
-            python_bin,
-            "scripts/generate_client_project.py",
-            "--name", be_name,
-            "--industry", spec.industry,
-            "--project-type", "api",
-            "--frontend", "none",
-            "--backend", spec.backend,
-            "--database", spec.database,
-            "--auth", spec.auth,
-            "--deploy", spec.deploy,
-            "--output-dir", str(output_root),
-            "--workers", str(args.workers),
-            "--rules-manifest", str(be_manifest_path),
-            "--skip-system-checks",
-            "--yes",
-        ]
-        if spec.features:
-            be_argv.extend(["--features", ",".join(spec.features)])
-        if comp_list:
-            be_argv.extend(["--compliance", ",".join(comp_list)])
-        if args.in_place:
-            be_argv.append("--in-place")
-        if args.no_cursor_assets:
-            be_argv.append("--no-cursor-assets")
-        if args.include_cursor_assets:
-            be_argv.append("--include-cursor-assets")
-        if args.force:
-            be_argv.append("--force")
-        print(f"\n[BE] {' '.join(shlex.quote(x) for x in be_argv)}")
-        code = run_argv(be_argv, cwd=repo_root)
-        if code != 0:
-            raise SystemExit(code)
-        # Post-scaffold: run Generate Cursor Rules unless disabled or assets suppressed
-        if not args.no_post_generate_rules and not args.no_cursor_assets:
-            rules_argv = [
-                python_bin,
-                "scripts/run_generate_rules.py",
-                "--project-dir", str(output_root / be_name),
-                "--overwrite",
-            ]
-            print(f"[BE][Rules] {' '.join(shlex.quote(x) for x in rules_argv)}")
-            rc = run_argv(rules_argv, cwd=repo_root)
-            if rc != 0:
-                raise SystemExit(rc)
-
+        scaffold_project(
+            tag="BE",
+            name=be_name,
+            project_type="api",
+            frontend="none",
+            backend=spec.backend,
+            database=spec.database,
+            manifest=build_be_manifest(spec.backend, spec.database, comp_list),
+            compliance=comp_list,
+            **common,
+        )
+
+    project_dirs = [output_root / name for name in (fe_name, be_name) if name]
+    record_generation(hash_path, fingerprint, sorted(snapshot_files(output_root, project_dirs)))
     print("\n✅ Generation complete.")
 
 
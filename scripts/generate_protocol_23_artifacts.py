@@ -12,15 +12,45 @@ from __future__ import annotations
 
 import ast
 import json
+import os
 import subprocess
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from json_io import dumps_pretty, load_cache, save_cache, source_key
 
-def extract_script_metadata(script_path: Path) -> Dict:
-    """Extract metadata from a Python script."""
+# Per-script metadata from earlier runs, kept next to the artifacts and reused
+# while a script's mtime, size and mode are unchanged
+METADATA_CACHE_FILE = ".ast-cache.json"
+METADATA_CACHE_VERSION = 1
+# Fewest uncached scripts worth the start-up cost of worker processes
+PARALLEL_MIN_SCRIPTS = 32
+# Fields through which statements nest; function and class definitions can only
+# appear as statements, so expressions never need to be visited
+STATEMENT_BLOCK_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+def iter_statements(tree: ast.AST):
+    """Yield the statements of ``tree`` in ``ast.walk`` order, skipping expressions."""
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        for field in STATEMENT_BLOCK_FIELDS:
+            block = getattr(node, field, None)
+            if isinstance(block, list):
+                queue.extend(block)
+        yield node
+
+
+def extract_script_metadata(script_path: Path, stat_result: Optional[os.stat_result] = None) -> Dict:
+    """Extract metadata from a Python script.
+
+    ``stat_result`` may be passed to reuse a stat the caller already has.
+    """
     try:
         content = script_path.read_text()
         tree = ast.parse(content)
@@ -31,7 +61,7 @@ def extract_script_metadata(script_path: Path) -> Dict:
         # Extract functions and classes
         functions = []
         classes = []
-        for node in ast.walk(tree):
+        for node in iter_statements(tree):
             if isinstance(node, ast.FunctionDef):
                 func_doc = ast.get_docstring(node) or ""
                 functions.append({
@@ -48,7 +78,7 @@ def extract_script_metadata(script_path: Path) -> Dict:
         
         # Count lines
         lines = content.splitlines()
-        code_lines = [line for line in lines if line.strip() and not line.strip().startswith("#")]
+        code_lines = sum(1 for line in lines if (stripped := line.strip()) and not stripped.startswith("#"))
         
         # Check for main guard
         has_main_guard = "if __name__ ==" in content
@@ -62,10 +92,10 @@ def extract_script_metadata(script_path: Path) -> Dict:
             "functions": functions,
             "classes": classes,
             "total_lines": len(lines),
-            "code_lines": len(code_lines),
+            "code_lines": code_lines,
             "has_main_guard": has_main_guard,
             "has_shebang": has_shebang,
-            "is_executable": script_path.stat().st_mode & 0o111 != 0
+            "is_executable": (stat_result or script_path.stat()).st_mode & 0o111 != 0
         }
     except Exception as e:
         return {
@@ -81,8 +111,22 @@ def extract_script_metadata(script_path: Path) -> Dict:
         }
 
 
-def generate_script_index(scripts_dir: Path, output_path: Path):
-    """Generate complete script index with metadata."""
+def load_metadata_cache(cache_path: Path) -> Dict[str, Dict]:
+    """Load cached script metadata, or nothing if it came from other code."""
+    return load_cache(cache_path, source_key(METADATA_CACHE_VERSION, Path(__file__)), "scripts")
+
+
+def save_metadata_cache(cache_path: Path, scripts: Dict[str, Dict]) -> None:
+    """Write the per-script metadata for the next run."""
+    save_cache(cache_path, source_key(METADATA_CACHE_VERSION, Path(__file__)), "scripts", scripts)
+
+
+def generate_script_index(scripts_dir: Path, output_path: Path, cache_path: Optional[Path] = None):
+    """Generate complete script index with metadata.
+
+    With ``cache_path``, scripts whose mtime, size and mode match the cache
+    are not read or parsed again.
+    """
     print("📋 Generating script index...")
     
     index = {
@@ -92,28 +136,63 @@ def generate_script_index(scripts_dir: Path, output_path: Path):
         "scripts": {}
     }
     
-    # Find all Python scripts
-    for script_path in sorted(scripts_dir.glob("*.py")):
-        if script_path.name.startswith("_") or script_path.name == "__init__.py":
-            continue
-        
-        metadata = extract_script_metadata(script_path)
+    # Find all Python scripts; DirEntry.stat() is stat'ed once and reused below
+    with os.scandir(scripts_dir) as it:
+        entries = sorted(
+            (entry for entry in it if entry.name.endswith(".py") and not entry.name.startswith("_")),
+            key=lambda entry: entry.name,
+        )
+    
+    cache = load_metadata_cache(cache_path) if cache_path is not None else {}
+    updated_cache: Dict[str, Dict] = {}
+    stats = {}
+    stale = []
+    for entry in entries:
+        st = entry.stat()
+        stamp = [st.st_mtime_ns, st.st_size, st.st_mode]
+        stats[entry.path] = st
+        cached = cache.get(entry.path)
+        if isinstance(cached, dict) and cached.get("stamp") == stamp:
+            updated_cache[entry.path] = cached
+        else:
+            updated_cache[entry.path] = {"stamp": stamp}
+            stale.append(entry.path)
+    
+    # Parse uncached scripts in worker processes when there are enough of them;
+    # ast.parse holds the GIL, so threads would not help
+    stale_paths = [Path(path) for path in stale]
+    stale_stats = [stats[path] for path in stale]
+    workers = min(len(stale), os.cpu_count() or 1)
+    if len(stale) < PARALLEL_MIN_SCRIPTS or workers < 2:
+        extracted = list(map(extract_script_metadata, stale_paths, stale_stats))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            extracted = list(executor.map(extract_script_metadata, stale_paths, stale_stats, chunksize=8))
+    for path, metadata in zip(stale, extracted):
+        updated_cache[path]["metadata"] = metadata
+    
+    for entry in entries:
+        script_path = Path(entry.path)
+        st = stats[entry.path]
+        metadata = updated_cache[entry.path]["metadata"]
         relative_path = script_path.relative_to(scripts_dir.parent)
         
         index["scripts"][str(relative_path)] = {
             "name": script_path.stem,
             "path": str(relative_path),
-            "size_bytes": script_path.stat().st_size,
-            "last_modified": datetime.fromtimestamp(script_path.stat().st_mtime).isoformat(),
+            "size_bytes": st.st_size,
+            "last_modified": datetime.fromtimestamp(st.st_mtime).isoformat(),
             **metadata
         }
         
         index["total_scripts"] += 1
     
+    if cache_path is not None and updated_cache != cache:
+        save_metadata_cache(cache_path, updated_cache)
+    
     # Write index
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, 'w') as f:
-        json.dump(index, f, indent=2)
+    output_path.write_bytes(dumps_pretty(index))
     
     print(f"✅ Script index generated: {output_path}")
     print(f"   Total scripts indexed: {index['total_scripts']}")
@@ -205,8 +284,7 @@ def audit_documentation(index: Dict, output_path: Path):
         )
     
     # Write audit
-    with open(output_path, 'w') as f:
-        json.dump(audit, f, indent=2)
+    output_path.write_bytes(dumps_pretty(audit))
     
     print(f"✅ Documentation audit generated: {output_path}")
     print(f"   Documentation score: {audit['documentation_score']}%")
@@ -275,8 +353,7 @@ def generate_remediation_backlog(
     backlog["total_issues"] = len(backlog["remediation_items"])
     
     # Write backlog
-    with open(output_path, 'w') as f:
-        json.dump(backlog, f, indent=2)
+    output_path.write_bytes(dumps_pretty(backlog))
     
     print(f"✅ Remediation backlog generated: {output_path}")
     print(f"   Total issues: {backlog['total_issues']}")
@@ -312,6 +389,11 @@ def main():
         default=Path(".artifacts/validation/script-registry-report.json"),
         help="Path to script registry validation report"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every script instead of reusing cached metadata"
+    )
     
     args = parser.parse_args()
     
@@ -319,7 +401,8 @@ def main():
     
     # Generate script index
     script_index_path = args.output_dir / "script-index.json"
-    index = generate_script_index(args.scripts_dir, script_index_path)
+    cache_path = None if args.no_cache else args.output_dir / METADATA_CACHE_FILE
+    index = generate_script_index(args.scripts_dir, script_index_path, cache_path)
     
     # Audit documentation
     doc_audit_path = args.output_dir / "documentation-audit.json"
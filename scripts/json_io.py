@@ -0,0 +1,95 @@
+"""JSON helpers shared by the report and manifest scripts.
+
+orjson is used when it is installed; the standard library ``json`` module is
+the fallback and produces the same indented, UTF-8 output.
+
+Cache files hold one or more named sections, each stored as
+``{"key": ..., "entries": {...}}``. A section is only reused while its key,
+usually ``source_key()`` of the code that produced it, still matches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Mapping
+
+orjson_spec = importlib.util.find_spec("orjson")
+orjson = importlib.import_module("orjson") if orjson_spec else None  # type: ignore[assignment]
+
+
+def loads(data: bytes):
+    """Parse JSON bytes, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> bytes:
+    """Serialize ``obj`` as compact UTF-8 JSON, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def dumps_pretty(obj) -> bytes:
+    """Serialize ``obj`` as indented UTF-8 JSON, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` through a temporary file, leaving it untouched if unchanged."""
+    try:
+        if path.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def source_key(version: int, *sources: Path) -> str:
+    """Identify the code behind cached data by a version number and the hash of its source files."""
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.read_bytes())
+    return f"{version}:{digest.hexdigest()}"
+
+
+def load_cache(cache_path: Path, key: str, section: str) -> Dict[str, Any]:
+    """Load the entries of one cache section, or nothing if it is missing or was saved under another key."""
+    try:
+        data = loads(cache_path.read_bytes())[section]
+        if data["key"] != key:
+            return {}
+        return dict(data["entries"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def save_cache(cache_path: Path, key: str, section: str, entries: Mapping[str, Any]) -> None:
+    """Write one cache section, keeping the file's other sections; failures are only reported."""
+    try:
+        data = loads(cache_path.read_bytes())
+        if not isinstance(data, dict):
+            data = {}
+    except (OSError, ValueError):
+        data = {}
+    data[section] = {"key": key, "entries": dict(entries)}
+    try:
+        atomic_write_bytes(cache_path, dumps(data))
+    except OSError as e:
+        print(f"Warning: could not save cache {cache_path}: {e}", file=sys.stderr)
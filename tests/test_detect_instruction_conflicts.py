@@ -0,0 +1,101 @@
+"""Tests for scripts/detect_instruction_conflicts.py."""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import detect_instruction_conflicts as dic  # noqa: E402
+
+
+def write_protocol(workspace: Path, name: str, content: str) -> None:
+    protocol_dir = workspace / ".cursor" / "ai-driven-workflow"
+    protocol_dir.mkdir(parents=True, exist_ok=True)
+    (protocol_dir / name).write_text(content, encoding="utf-8")
+
+
+def run_main(argv):
+    with pytest.raises(SystemExit) as exit_info:
+        dic.main(argv)
+    return exit_info.value.code
+
+
+def test_main_single_protocol_reports_status_and_summary(tmp_path, capsys):
+    write_protocol(tmp_path, "1-create-prd.md", "[MUST] maybe run the build.\n")
+
+    code = run_main(["--workspace", str(tmp_path), "--protocol", "1", "--no-cache"])
+
+    out = capsys.readouterr().out
+    assert code == 2
+    assert "Status: WARNING" in out
+    assert "Total Protocols: 1" in out
+    assert "Ambiguities: 1" in out
+
+
+def test_main_single_protocol_writes_same_shape_as_full_run(tmp_path):
+    write_protocol(tmp_path, "1-create-prd.md", "[MUST] never skip.\n[MUST] always run.\n")
+    output = tmp_path / "results.json"
+
+    code = run_main(["--workspace", str(tmp_path), "--protocol", "1", "--no-cache", "--output", str(output)])
+
+    results = json.loads(output.read_text())
+    full = dic.InstructionConflictDetector(str(tmp_path), use_cache=False).detect_instruction_conflicts()
+    assert code == 1
+    assert results["status"] == "fail"
+    assert set(results) == set(full)
+    assert set(results["summary"]) == set(full["summary"])
+    # Only protocol 1 exists, so its counts match the full run's
+    for key in ("contradictions", "ambiguities", "completeness_issues"):
+        assert results["summary"][key] == full["summary"][key]
+        assert results[key] == full[key]
+    assert results["summary"]["contradictions"] > 0
+
+
+def test_main_single_protocol_passes_clean_content(tmp_path, capsys):
+    write_protocol(tmp_path, "1-create-prd.md", "# Create PRD\n\nWrite the document.\n")
+
+    assert run_main(["--workspace", str(tmp_path), "--protocol", "1", "--no-cache"]) == 0
+    assert "Status: PASS" in capsys.readouterr().out
+
+
+def test_main_unknown_protocol_exits_with_error(tmp_path, capsys):
+    assert run_main(["--workspace", str(tmp_path), "--protocol", "99"]) == 1
+    assert "Protocol 99 not found" in capsys.readouterr().out
+
+
+# Worst cases for the directive patterns: a keyword far past its tag, and a
+# line crowded with tags that an unbounded .*? rescans once per tag
+PATHOLOGICAL_TIME_LIMIT = 2.0
+
+
+def scan(content: str):
+    detector = dic.InstructionConflictDetector("/nonexistent", use_cache=False)
+    started = time.perf_counter()
+    results = detector._detect_single_protocol_conflicts("1", content)
+    return results, time.perf_counter() - started
+
+
+def test_keyword_beyond_directive_span_is_not_matched():
+    results, elapsed = scan("[MUST] " + "a" * 100_000 + " maybe\n")
+
+    assert results["ambiguities"] == []
+    assert elapsed < PATHOLOGICAL_TIME_LIMIT
+
+
+def test_line_crowded_with_ambiguous_directives_scans_in_bounded_time():
+    results, elapsed = scan("[MUST] " * 2000 + "maybe\n")
+
+    assert [ambiguity["type"] for ambiguity in results["ambiguities"]] == ["vague_must_directive"]
+    assert elapsed < PATHOLOGICAL_TIME_LIMIT
+
+
+def test_line_crowded_with_negated_directives_scans_in_bounded_time():
+    results, elapsed = scan("[MUST] not " * 2000 + "always\n")
+
+    assert [contradiction["type"] for contradiction in results["contradictions"]] == ["must_never_vs_always"]
+    assert elapsed < PATHOLOGICAL_TIME_LIMIT
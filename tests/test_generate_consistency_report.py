@@ -0,0 +1,62 @@
+"""Tests for scripts/generate_consistency_report.py."""
+
+import itertools
+import random
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import generate_consistency_report as gcr  # noqa: E402
+
+POLARITIES = list(itertools.product((False, True), repeat=2))
+
+
+def brute_force_conflicts(must_polarities, strict_polarities):
+    """Compare every MUST with every STRICT directive, as the pairwise loop did."""
+    return sum(
+        1
+        for (must_negative, must_positive), (strict_negative, strict_positive)
+        in itertools.product(must_polarities, strict_polarities)
+        if (must_negative and strict_positive) or (must_positive and strict_negative)
+    )
+
+
+def test_conflicting_pairs_match_brute_force_for_small_inputs():
+    for must_count in range(4):
+        for strict_count in range(4):
+            for must in itertools.product(POLARITIES, repeat=must_count):
+                for strict in itertools.product(POLARITIES, repeat=strict_count):
+                    assert gcr._count_conflicting_pairs(list(must), list(strict)) == brute_force_conflicts(must, strict)
+
+
+def test_conflicting_pairs_match_brute_force_for_random_inputs():
+    rng = random.Random(0)
+    for _ in range(500):
+        must = [rng.choice(POLARITIES) for _ in range(rng.randint(0, 30))]
+        strict = [rng.choice(POLARITIES) for _ in range(rng.randint(0, 30))]
+        assert gcr._count_conflicting_pairs(must, strict) == brute_force_conflicts(must, strict)
+
+
+def test_directives_that_are_both_negative_and_positive_count_once_per_pair():
+    both = (True, True)
+    assert gcr._count_conflicting_pairs([both], [both]) == 1
+    assert gcr._count_conflicting_pairs([both, both], [both, (False, True)]) == 4
+
+
+def test_conflict_report_aggregates_pairs_per_protocol():
+    generator = gcr.ConsistencyReportGenerator(use_cache=False)
+    directive = lambda context: {"context": context}  # noqa: E731
+    protocol_data = {
+        "01": {"directives": {
+            "MUST": [directive("never skip it"), directive("run it")],
+            "STRICT": [directive("always run"), directive("avoid it"), directive("plain")],
+        }},
+        "02": {"directives": {"MUST": [directive("plain")], "STRICT": [directive("plain")]}},
+    }
+
+    report = generator._generate_conflict_report(protocol_data)
+
+    assert [(c["protocol"], c["count"]) for c in report["contradictions"]] == [("01", 2)]
+    assert report["total_conflicts"] == 2
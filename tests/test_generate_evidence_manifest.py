@@ -0,0 +1,51 @@
+"""Tests for scripts/generate_evidence_manifest.py."""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import generate_evidence_manifest as gem  # noqa: E402
+
+
+def make_tree(tmp_path):
+    protocol = tmp_path / "01-demo.md"
+    protocol.write_text("# Demo\n\npython scripts/sub/tool.py\npython scripts/run.py\n", encoding="utf-8")
+    scripts_dir = tmp_path / "scripts"
+    (scripts_dir / "sub").mkdir(parents=True)
+    (scripts_dir / "run.py").write_text("")
+    return protocol, scripts_dir, tmp_path / "cache.json"
+
+
+def test_cached_inventory_notices_script_added_in_subdirectory(tmp_path):
+    protocol, scripts_dir, cache_path = make_tree(tmp_path)
+    first, = gem.load_inventories([protocol], scripts_dir, cache_path)
+    assert first.missing_scripts == ["sub/tool.py"]
+
+    (scripts_dir / "sub" / "tool.py").write_text("")
+    second, = gem.load_inventories([protocol], scripts_dir, cache_path)
+
+    assert second.missing_scripts == []
+    assert second.existing_scripts == ["run.py", "sub/tool.py"]
+
+
+def test_cached_inventory_notices_script_removed_from_subdirectory(tmp_path):
+    protocol, scripts_dir, cache_path = make_tree(tmp_path)
+    (scripts_dir / "sub" / "tool.py").write_text("")
+    assert gem.load_inventories([protocol], scripts_dir, cache_path)[0].missing_scripts == []
+
+    (scripts_dir / "sub" / "tool.py").unlink()
+
+    assert gem.load_inventories([protocol], scripts_dir, cache_path)[0].missing_scripts == ["sub/tool.py"]
+
+
+def test_unchanged_inventory_is_served_from_cache(tmp_path, monkeypatch):
+    protocol, scripts_dir, cache_path = make_tree(tmp_path)
+    first = gem.load_inventories([protocol], scripts_dir, cache_path)
+
+    def fail(*args):
+        raise AssertionError("inventory rebuilt")
+
+    monkeypatch.setattr(gem.inventory_protocols, "build_inventory", fail)
+    assert gem.load_inventories([protocol], scripts_dir, cache_path) == first
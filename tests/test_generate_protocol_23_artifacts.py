@@ -0,0 +1,104 @@
+"""Tests for scripts/generate_protocol_23_artifacts.py."""
+
+import ast
+import sys
+import textwrap
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import generate_protocol_23_artifacts as p23  # noqa: E402
+
+DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+SOURCE = textwrap.dedent(
+    """
+    import os
+
+    def top(value):
+        def inner():
+            class InnerClass:
+                def method(self):
+                    pass
+        return inner
+
+    try:
+        def in_try():
+            pass
+    except ValueError:
+        def in_except():
+            pass
+    except (KeyError, TypeError) as exc:
+        class InExcept:
+            pass
+    else:
+        def in_else():
+            pass
+    finally:
+        def in_finally():
+            pass
+
+    match os.name:
+        case "posix":
+            def in_case():
+                pass
+        case "nt" if True:
+            class InGuardedCase:
+                async def method(self):
+                    pass
+        case _:
+            pass
+
+    for item in range(3):
+        def in_for():
+            pass
+    else:
+        def in_for_else():
+            pass
+
+    with open(__file__) as handle:
+        if handle:
+            async def in_with_if():
+                pass
+        elif not handle:
+            def in_elif():
+                pass
+        else:
+            while False:
+                def in_while():
+                    pass
+
+    class Outer:
+        def method(self):
+            def helper():
+                pass
+
+        class Nested:
+            def method(self):
+                pass
+    """
+)
+
+
+def definitions(nodes):
+    return [(type(node).__name__, node.name, node.lineno) for node in nodes if isinstance(node, DEFINITIONS)]
+
+
+def test_iter_statements_finds_definitions_in_ast_walk_order():
+    tree = ast.parse(SOURCE)
+
+    found = definitions(p23.iter_statements(tree))
+
+    assert found == definitions(ast.walk(tree))
+    assert {name for _, name, _ in found} >= {
+        "in_try", "in_except", "InExcept", "in_else", "in_finally",
+        "in_case", "InGuardedCase", "in_for_else", "in_elif", "in_while", "helper",
+    }
+
+
+def test_iter_statements_skips_expressions():
+    tree = ast.parse(SOURCE)
+
+    assert all(isinstance(node, (ast.Module, ast.stmt, ast.excepthandler, ast.match_case))
+               for node in p23.iter_statements(tree))
@@ -0,0 +1,69 @@
+"""Tests for scripts/json_io.py."""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import json_io  # noqa: E402
+
+
+def test_cache_round_trip(tmp_path):
+    cache_path = tmp_path / ".artifacts" / "cache.json"
+
+    json_io.save_cache(cache_path, "1:abc", "protocols", {"01": {"sha256": "x"}})
+
+    assert json_io.load_cache(cache_path, "1:abc", "protocols") == {"01": {"sha256": "x"}}
+    assert [path.name for path in cache_path.parent.iterdir()] == ["cache.json"]
+
+
+def test_cache_saved_under_another_key_is_ignored(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    json_io.save_cache(cache_path, "1:abc", "protocols", {"01": 1})
+
+    assert json_io.load_cache(cache_path, "2:abc", "protocols") == {}
+    assert json_io.load_cache(cache_path, "1:abc", "scripts") == {}
+
+
+def test_missing_or_corrupt_cache_loads_empty(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    assert json_io.load_cache(cache_path, "1:abc", "protocols") == {}
+
+    cache_path.write_text("{not json")
+    assert json_io.load_cache(cache_path, "1:abc", "protocols") == {}
+
+    json_io.save_cache(cache_path, "1:abc", "protocols", {"01": 1})
+    assert json_io.load_cache(cache_path, "1:abc", "protocols") == {"01": 1}
+
+
+def test_saving_a_section_keeps_the_others(tmp_path):
+    cache_path = tmp_path / "cache.json"
+    json_io.save_cache(cache_path, "key2", "cycle2", {"a.md": "1"})
+    json_io.save_cache(cache_path, "key3", "cycle3", {"b.md": "2"})
+    json_io.save_cache(cache_path, "key2", "cycle2", {"a.md": "3"})
+
+    assert json_io.load_cache(cache_path, "key2", "cycle2") == {"a.md": "3"}
+    assert json_io.load_cache(cache_path, "key3", "cycle3") == {"b.md": "2"}
+
+
+def test_source_key_changes_with_source_and_version(tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text("VALUE = 1\n")
+    key = json_io.source_key(1, source)
+
+    assert json_io.source_key(1, source) == key
+    assert json_io.source_key(2, source) != key
+    source.write_text("VALUE = 2\n")
+    assert json_io.source_key(1, source) != key
+
+
+def test_atomic_write_leaves_unchanged_file_alone(tmp_path):
+    path = tmp_path / "out.json"
+    json_io.atomic_write_bytes(path, b"{}")
+    mtime = path.stat().st_mtime_ns
+
+    json_io.atomic_write_bytes(path, b"{}")
+
+    assert path.stat().st_mtime_ns == mtime
+    assert path.read_bytes() == b"{}"